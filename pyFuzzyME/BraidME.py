@@ -67,10 +67,13 @@
 #------------------------------------------------------------------#
 import numpy as np
 import os
-import copy as cp
 import pickle
 import math
+import logging
 import sys
+import functools
+import hashlib
+import collections
 
 # Import fuzzy stuff from FuzzyTools
 #------------------------------------------------------------------#
@@ -86,272 +89,373 @@ from FuzzyTools import Zmf
 from FuzzyTools import Smf
 '''
 
-class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for all fuzzy tools
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+# Bound check and linear extrapolation of one input vector, compiled by
+# numba if available. Division by a zero width extrapolation interval
+# yields inf as in the batch evaluation, hence no fastmath (it assumes
+# finite values)
+#------------------------------------------------------------------#
+def _BoundCheck(xArr, yL, yU, y0, ME0, y1, ME1, MEOrg, Extrapolate, xOrg):
+    MEReturn = MEOrg
+    Violation = False
+    for i in range(xArr.shape[0]):
+        if xArr[i] < yL[i]:
+            xOrg[i] = yL[i]
+            Violation = True
+            if Extrapolate:
+                MEReturn += (ME0[i]-MEOrg)/(y0[i]-yL[i])*(xArr[i]-yL[i])
+        elif xArr[i] > yU[i]:
+            xOrg[i] = yU[i]
+            Violation = True
+            if Extrapolate:
+                MEReturn += (ME1[i]-MEOrg)/(y1[i]-yU[i])*(xArr[i]-yU[i])
+        else:
+            xOrg[i] = xArr[i]
+    return (MEReturn, Violation)
+if njit is not None:
+    _BoundCheck = njit(cache=True, error_model='numpy')(_BoundCheck)
+
+class BraidME(FIS):        # Base class for all fuzzy tools
     nBobins         = 16.0*12
     MaxPatches      = 15.
+    MemoSize        = 4096
+    DEG2RAD         = math.pi/180.0
+    _CWD            = None  # Working directory at first construction
+    # Bounds of the FIS inputs and linear extrapolation beyond them
+    #      Phi,   b,     R/D,   r,     a/b,   Ply#,  Patch#
+    yL  = np.array([  15,  1.5,    0.,    3.,    2.,    5.,    0.], dtype=np.float64)
+    yU  = np.array([  75,   4.,   10.,    5.,    4.,   20.,    5.], dtype=np.float64)
+    (MEmin, MEmax) = (0.1, 1.1)
+    y0  = np.array([   0.,   0.1,    0.,   0.1, -1000, -40.0,    0.], dtype=np.float64)
+    ME0 = np.array([MEmax, MEmax, MEmax, MEmax, MEmin, MEmin, MEmin], dtype=np.float64)
+    y1  = np.array([  90.,  10.0, 1.0e6, 1.0e6, 1.0e3, 100.0,   50.], dtype=np.float64)
+    ME1 = np.array([MEmax, MEmax, MEmin, MEmin, MEmax, MEmax, MEmax], dtype=np.float64)
 
-    def __init__(self,FDTol=1.0e-4):
+    def __init__(self,FDTol=1.0e-4,UseFuzzyMemo=False,AnalyticSens=False):
         self.FDTol = FDTol
-        self.CurPath = os.getcwd()
+        # Sensitivities by analytic derivatives of the FIS instead of finite differences
+        self.AnalyticSens = AnalyticSens
+        # Fuzzy memoization of responses on a grid of 10*FDTol (not exact!)
+        self.UseFuzzyMemo = UseFuzzyMemo
+        self._Memo = collections.OrderedDict()
+        if BraidME._CWD is None:
+            BraidME._CWD = os.getcwd()
+        self.CurPath = BraidME._CWD
         self.SupportDictKeys = ['ProfileCircumferences', 'PathLength', \
             'ProfileMinRadius', 'PathRadii', 'ProfileAspect', 'PlyNum', \
             'PatchNum', 'BraidingAngle']
+        # FIS input dict reused by every point evaluation
+        self.InVals = dict.fromkeys(['BraidAngle', 'YarnWidth', 'RadiusDiameterRatio', \
+            'EdgeRadius', 'AspectRatio', 'PlyNum', 'PatchNum', 'Sub1', 'Sub2', 'Sub3'], 0.0)
         self.UpdateHornGearParams()
 
     def UpdateHornGearParams(self):
-        self.nHornGears      = cp.deepcopy(self.nBobins/2.0)
+        self.nHornGears      = self.nBobins/2.0
         self.HornGearSpeed   = 120.0*1.0/60.0 # 120 rmp is common!
 
-    def CreateAndSaveBraidFIS(self):
+    @staticmethod
+    def _SourceHash():
+        '''
+        Hash of the FIS definitions (source of BraidME and FuzzyTools) used
+        to detect an outdated BraidFIS.p
+        '''
+        SourceHash = hashlib.sha1()
+        for ModuleName in (__name__, FIS.__module__):
+            with open(sys.modules[ModuleName].__file__, 'rb') as SourceFile:
+                SourceHash.update(SourceFile.read())
+        return SourceHash.hexdigest()
+
+    @classmethod
+    @functools.lru_cache(maxsize=1)
+    def _BuildOrLoadTemplate(cls, Path):
+        '''
+        Returns the pickled BraidFIS template shared by all BraidME instances
+        - loads Path/BraidFIS.p if it has been created from the current sources
+        - otherwise builds the FIS from scratch and (re)writes Path/BraidFIS.p
+        '''
+        FileName = os.path.join(Path, 'BraidFIS.p')
+        SourceHash = cls._SourceHash()
+        if os.path.isfile(FileName):
+            try:
+                with open(FileName, 'rb') as FISFile:
+                    BraidFIS = pickle.load(FISFile)
+                    StoredHash = pickle.load(FISFile)
+                if StoredHash == SourceHash:
+                    return pickle.dumps(BraidFIS, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                pass
+        BraidFIS = cls._BuildBraidFIS()
+        with open(FileName, 'wb') as FISFile:
+            # LoadBraidFIS only reads the first object, the hash is appended
+            pickle.dump(BraidFIS, FISFile, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(SourceHash, FISFile, protocol=pickle.HIGHEST_PROTOCOL)
+        return pickle.dumps(BraidFIS, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @staticmethod
+    def _BuildBraidFIS():
         # Sub-FIS 1
         # ------------------------------------------------------------------- #
-        self.SubFIS1        = FIS(FISname='SubFIS1:OverCompacting,BraidOpening,UnrealisticMachine,ProductionTimes')
-        self.SubFIS1.Input  = dict()
-        self.SubFIS1.Output = dict()
-        self.SubFIS1.Rules  = dict()
+        SubFIS1        = FIS(FISname='SubFIS1:OverCompacting,BraidOpening,UnrealisticMachine,ProductionTimes')
+        SubFIS1.Input  = dict()
+        SubFIS1.Output = dict()
+        SubFIS1.Rules  = dict()
         # Input - Braiding angle
-        self.SubFIS1.Input['BraidAngle'] = dict()
-        self.SubFIS1.Input['BraidAngle']['Range'] = [15.0, 75.0]
-        self.SubFIS1.Input['BraidAngle']['MF'] = dict()
-        self.SubFIS1.Input['BraidAngle']['MF']['VerySmall'] = Gauss2mf(2.0, 10.0, 4.0, 15.0)
-        self.SubFIS1.Input['BraidAngle']['MF']['Small'] = Gaussmf(4.0, 25.0)
-        self.SubFIS1.Input['BraidAngle']['MF']['Moderatesmall'] = Gaussmf(4.0, 35.0)
-        self.SubFIS1.Input['BraidAngle']['MF']['Moderate'] = Gaussmf(4.0, 45.0)
-        self.SubFIS1.Input['BraidAngle']['MF']['ModerateBig'] = Gaussmf(4.0, 55.0)
-        self.SubFIS1.Input['BraidAngle']['MF']['Big'] = Gaussmf(4.0, 65.0)
-        self.SubFIS1.Input['BraidAngle']['MF']['VeryBig'] = Gauss2mf(4.0, 75.0, 2.0, 80.0)
-        self.SubFIS1.Input['BraidAngle']['MF']['Any'] = Const(1.0)
+        SubFIS1.Input['BraidAngle'] = dict()
+        SubFIS1.Input['BraidAngle']['Range'] = [15.0, 75.0]
+        SubFIS1.Input['BraidAngle']['MF'] = dict()
+        SubFIS1.Input['BraidAngle']['MF']['VerySmall'] = Gauss2mf(2.0, 10.0, 4.0, 15.0)
+        SubFIS1.Input['BraidAngle']['MF']['Small'] = Gaussmf(4.0, 25.0)
+        SubFIS1.Input['BraidAngle']['MF']['Moderatesmall'] = Gaussmf(4.0, 35.0)
+        SubFIS1.Input['BraidAngle']['MF']['Moderate'] = Gaussmf(4.0, 45.0)
+        SubFIS1.Input['BraidAngle']['MF']['ModerateBig'] = Gaussmf(4.0, 55.0)
+        SubFIS1.Input['BraidAngle']['MF']['Big'] = Gaussmf(4.0, 65.0)
+        SubFIS1.Input['BraidAngle']['MF']['VeryBig'] = Gauss2mf(4.0, 75.0, 2.0, 80.0)
+        SubFIS1.Input['BraidAngle']['MF']['Any'] = Const(1.0)
         # Input - Yarn width
-        self.SubFIS1.Input['YarnWidth'] = dict()
-        self.SubFIS1.Input['YarnWidth']['Range'] = [1.5, 4.0]
-        self.SubFIS1.Input['YarnWidth']['MF'] = dict()
-        self.SubFIS1.Input['YarnWidth']['MF']['TooSmall'] = Gauss2mf(.22, 1.0, .22, 1.5)
-        self.SubFIS1.Input['YarnWidth']['MF']['Moderate'] = Gauss2mf(.22, 2.25, .22, 3.25)
-        self.SubFIS1.Input['YarnWidth']['MF']['TooBig']   = Gauss2mf(.22, 4.0, .22, 4.5)
-        self.SubFIS1.Input['YarnWidth']['MF']['Any'] = Const(1.0)
+        SubFIS1.Input['YarnWidth'] = dict()
+        SubFIS1.Input['YarnWidth']['Range'] = [1.5, 4.0]
+        SubFIS1.Input['YarnWidth']['MF'] = dict()
+        SubFIS1.Input['YarnWidth']['MF']['TooSmall'] = Gauss2mf(.22, 1.0, .22, 1.5)
+        SubFIS1.Input['YarnWidth']['MF']['Moderate'] = Gauss2mf(.22, 2.25, .22, 3.25)
+        SubFIS1.Input['YarnWidth']['MF']['TooBig']   = Gauss2mf(.22, 4.0, .22, 4.5)
+        SubFIS1.Input['YarnWidth']['MF']['Any'] = Const(1.0)
         # Output - Sub1
-        self.SubFIS1.Output['Sub1'] = dict()
-        self.SubFIS1.Output['Sub1']['Range'] = [0.0, 1.0]
-        self.SubFIS1.Output['Sub1']['MF'] = dict()
-        self.SubFIS1.Output['Sub1']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
-        self.SubFIS1.Output['Sub1']['MF']['Low'] = Gaussmf(0.082, 0.1)
-        self.SubFIS1.Output['Sub1']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
-        self.SubFIS1.Output['Sub1']['MF']['High'] = Gaussmf(0.082, 0.4)
-        self.SubFIS1.Output['Sub1']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
-        self.SubFIS1.Output['Sub1']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
+        SubFIS1.Output['Sub1'] = dict()
+        SubFIS1.Output['Sub1']['Range'] = [0.0, 1.0]
+        SubFIS1.Output['Sub1']['MF'] = dict()
+        SubFIS1.Output['Sub1']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
+        SubFIS1.Output['Sub1']['MF']['Low'] = Gaussmf(0.082, 0.1)
+        SubFIS1.Output['Sub1']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
+        SubFIS1.Output['Sub1']['MF']['High'] = Gaussmf(0.082, 0.4)
+        SubFIS1.Output['Sub1']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
+        SubFIS1.Output['Sub1']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
         # Rules Sub-FIS1
-        self.SubFIS1.Rules['OverCompTakeUpSpeedInfinity'] = ['OR','BraidAngle','VerySmall','YarnWidth','TooSmall','THEN','Sub1','NotManufacturable']
-        self.SubFIS1.Rules['BraidOpenHornGearSpeedInfinity'] = ['OR','BraidAngle','VeryBig','YarnWidth','TooBig','THEN','Sub1','NotManufacturable']
-        self.SubFIS1.Rules['VLowestPTimes'] = ['AND','BraidAngle','Small','YarnWidth','Moderate','THEN','Sub1','VeryLow']
-        self.SubFIS1.Rules['LowPTimes'] = ['AND','BraidAngle','Moderatesmall','YarnWidth','Moderate','THEN','Sub1','Low']
-        self.SubFIS1.Rules['ModeratePTimes'] = ['AND','BraidAngle','Moderate','YarnWidth','Moderate','THEN','Sub1','Moderate']
-        self.SubFIS1.Rules['HighPTimes'] = ['AND','BraidAngle','ModerateBig','YarnWidth','Moderate','THEN','Sub1','High']
-        self.SubFIS1.Rules['VeryHighPTimes'] = ['AND','BraidAngle','Big','YarnWidth','Moderate','THEN','Sub1','VeryHigh']
+        SubFIS1.Rules['OverCompTakeUpSpeedInfinity'] = ['OR','BraidAngle','VerySmall','YarnWidth','TooSmall','THEN','Sub1','NotManufacturable']
+        SubFIS1.Rules['BraidOpenHornGearSpeedInfinity'] = ['OR','BraidAngle','VeryBig','YarnWidth','TooBig','THEN','Sub1','NotManufacturable']
+        SubFIS1.Rules['VLowestPTimes'] = ['AND','BraidAngle','Small','YarnWidth','Moderate','THEN','Sub1','VeryLow']
+        SubFIS1.Rules['LowPTimes'] = ['AND','BraidAngle','Moderatesmall','YarnWidth','Moderate','THEN','Sub1','Low']
+        SubFIS1.Rules['ModeratePTimes'] = ['AND','BraidAngle','Moderate','YarnWidth','Moderate','THEN','Sub1','Moderate']
+        SubFIS1.Rules['HighPTimes'] = ['AND','BraidAngle','ModerateBig','YarnWidth','Moderate','THEN','Sub1','High']
+        SubFIS1.Rules['VeryHighPTimes'] = ['AND','BraidAngle','Big','YarnWidth','Moderate','THEN','Sub1','VeryHigh']
 
         # Sub-FIS 2
         # ------------------------------------------------------------------- #
-        self.SubFIS2        = FIS(FISname='SubFIS2:CombinationBraidAngleAndRatioOfRadiusDiameter')
-        self.SubFIS2.Input  = dict()
-        self.SubFIS2.Output = dict()
-        self.SubFIS2.Rules  = dict()
+        SubFIS2        = FIS(FISname='SubFIS2:CombinationBraidAngleAndRatioOfRadiusDiameter')
+        SubFIS2.Input  = dict()
+        SubFIS2.Output = dict()
+        SubFIS2.Rules  = dict()
         # Input - Braiding angle
-        self.SubFIS2.Input['BraidAngle'] = dict()
-        self.SubFIS2.Input['BraidAngle']['Range'] = [15.0, 75.0]
-        self.SubFIS2.Input['BraidAngle']['MF'] = dict()
-        self.SubFIS2.Input['BraidAngle']['MF']['VerySmall'] = Gauss2mf(2.0, 10.0, 4.0, 15.0)
-        self.SubFIS2.Input['BraidAngle']['MF']['Small'] = Gaussmf(4.0, 25.0)
-        self.SubFIS2.Input['BraidAngle']['MF']['Moderatesmall'] = Gaussmf(4.0, 35.0)
-        self.SubFIS2.Input['BraidAngle']['MF']['Moderate'] = Gaussmf(4.0, 45.0)
-        self.SubFIS2.Input['BraidAngle']['MF']['ModerateBig'] = Gaussmf(4.0, 55.0)
-        self.SubFIS2.Input['BraidAngle']['MF']['Big'] = Gaussmf(4.0, 65.0)
-        self.SubFIS2.Input['BraidAngle']['MF']['VeryBig'] = Gauss2mf(4.0, 75.0, 2.0, 80.0)
-        self.SubFIS2.Input['BraidAngle']['MF']['Any'] = Const(1.0)
+        SubFIS2.Input['BraidAngle'] = dict()
+        SubFIS2.Input['BraidAngle']['Range'] = [15.0, 75.0]
+        SubFIS2.Input['BraidAngle']['MF'] = dict()
+        SubFIS2.Input['BraidAngle']['MF']['VerySmall'] = Gauss2mf(2.0, 10.0, 4.0, 15.0)
+        SubFIS2.Input['BraidAngle']['MF']['Small'] = Gaussmf(4.0, 25.0)
+        SubFIS2.Input['BraidAngle']['MF']['Moderatesmall'] = Gaussmf(4.0, 35.0)
+        SubFIS2.Input['BraidAngle']['MF']['Moderate'] = Gaussmf(4.0, 45.0)
+        SubFIS2.Input['BraidAngle']['MF']['ModerateBig'] = Gaussmf(4.0, 55.0)
+        SubFIS2.Input['BraidAngle']['MF']['Big'] = Gaussmf(4.0, 65.0)
+        SubFIS2.Input['BraidAngle']['MF']['VeryBig'] = Gauss2mf(4.0, 75.0, 2.0, 80.0)
+        SubFIS2.Input['BraidAngle']['MF']['Any'] = Const(1.0)
         # Input - Ratio of radius to diameter
-        self.SubFIS2.Input['RadiusDiameterRatio'] = dict()
-        self.SubFIS2.Input['RadiusDiameterRatio']['Range'] = [0.5, 10.0]
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF'] = dict()
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF']['VerySmall'] = Gaussmf(.5, 0.0)
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF']['Small'] = Gaussmf(.5, 1.2)
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF']['Moderate'] = Gaussmf(.6, 2.4)
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF']['Big'] = Gaussmf(.7, 4.0)
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF']['Bigger'] = Gaussmf(.8, 6.0)
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF']['VeryBig'] = Gaussmf(.8, 7.8)
-        self.SubFIS2.Input['RadiusDiameterRatio']['MF']['NoCurvature'] = Gaussmf(.9, 10)
+        SubFIS2.Input['RadiusDiameterRatio'] = dict()
+        SubFIS2.Input['RadiusDiameterRatio']['Range'] = [0.5, 10.0]
+        SubFIS2.Input['RadiusDiameterRatio']['MF'] = dict()
+        SubFIS2.Input['RadiusDiameterRatio']['MF']['VerySmall'] = Gaussmf(.5, 0.0)
+        SubFIS2.Input['RadiusDiameterRatio']['MF']['Small'] = Gaussmf(.5, 1.2)
+        SubFIS2.Input['RadiusDiameterRatio']['MF']['Moderate'] = Gaussmf(.6, 2.4)
+        SubFIS2.Input['RadiusDiameterRatio']['MF']['Big'] = Gaussmf(.7, 4.0)
+        SubFIS2.Input['RadiusDiameterRatio']['MF']['Bigger'] = Gaussmf(.8, 6.0)
+        SubFIS2.Input['RadiusDiameterRatio']['MF']['VeryBig'] = Gaussmf(.8, 7.8)
+        SubFIS2.Input['RadiusDiameterRatio']['MF']['NoCurvature'] = Gaussmf(.9, 10)
         # Output - Sub2
-        self.SubFIS2.Output['Sub2'] = dict()
-        self.SubFIS2.Output['Sub2']['Range'] = [0, 1.0]
-        self.SubFIS2.Output['Sub2']['MF'] = dict()
-        self.SubFIS2.Output['Sub2']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
-        self.SubFIS2.Output['Sub2']['MF']['Low'] = Gaussmf(0.082, 0.1)
-        self.SubFIS2.Output['Sub2']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
-        self.SubFIS2.Output['Sub2']['MF']['High'] = Gaussmf(0.082, 0.4)
-        self.SubFIS2.Output['Sub2']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
-        self.SubFIS2.Output['Sub2']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
+        SubFIS2.Output['Sub2'] = dict()
+        SubFIS2.Output['Sub2']['Range'] = [0, 1.0]
+        SubFIS2.Output['Sub2']['MF'] = dict()
+        SubFIS2.Output['Sub2']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
+        SubFIS2.Output['Sub2']['MF']['Low'] = Gaussmf(0.082, 0.1)
+        SubFIS2.Output['Sub2']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
+        SubFIS2.Output['Sub2']['MF']['High'] = Gaussmf(0.082, 0.4)
+        SubFIS2.Output['Sub2']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
+        SubFIS2.Output['Sub2']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
         # Rules Sub-FIS2
-        self.SubFIS2.Rules['CurvatureTooGreatTakeUp'] = ['OR','BraidAngle','VerySmall','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['CurvatureTooGreatHornGear'] = ['OR','BraidAngle','VeryBig','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['OverCriticalCombAngleCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['OverCriticalCombAngleCurvature2'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['CriticalCombAngleCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Big','THEN','Sub2','VeryHigh']
-        self.SubFIS2.Rules['ModerateCombAngleCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Bigger','THEN','Sub2','Moderate']
-        self.SubFIS2.Rules['AlmostNoCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['NoCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['OverCriticalCombAngleCurvature3'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['CriticalCombAngleCurvature2'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Moderate','THEN','Sub2','VeryHigh']
-        self.SubFIS2.Rules['CombAngleCurvature1'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
-        self.SubFIS2.Rules['AlmostNoCurvature2'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
-        self.SubFIS2.Rules['AlmostNoCurvature3'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['NoCurvature2'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['CriticalCombAngleCurvature3'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Small','THEN','Sub2','VeryHigh']
-        self.SubFIS2.Rules['CriticalCombAngleCurvature4'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Moderate','THEN','Sub2','High']
-        self.SubFIS2.Rules['CombAngleCurvature2'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
-        self.SubFIS2.Rules['AlmostNoCurvature4'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
-        self.SubFIS2.Rules['AlmostNoCurvature5'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['NoCurvature3'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['OverCriticalCombAngleCurvature4'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['CriticalCombAngleCurvature5'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Moderate','THEN','Sub2','VeryHigh']
-        self.SubFIS2.Rules['CombAngleCurvature3'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
-        self.SubFIS2.Rules['AlmostNoCurvature6'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
-        self.SubFIS2.Rules['AlmostNoCurvature7'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['NoCurvature4'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['OverCriticalCombAngleCurvature5'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['OverCriticalCombAngleCurvature6'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
-        self.SubFIS2.Rules['CriticalCombAngleCurvature6'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Big','THEN','Sub2','VeryHigh']
-        self.SubFIS2.Rules['ModerateCombAngleCurvature2'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Bigger','THEN','Sub2','Moderate']
-        self.SubFIS2.Rules['AlmostNoCurvature8'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
-        self.SubFIS2.Rules['NoCurvature5'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['CurvatureTooGreatTakeUp'] = ['OR','BraidAngle','VerySmall','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['CurvatureTooGreatHornGear'] = ['OR','BraidAngle','VeryBig','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['OverCriticalCombAngleCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['OverCriticalCombAngleCurvature2'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['CriticalCombAngleCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Big','THEN','Sub2','VeryHigh']
+        SubFIS2.Rules['ModerateCombAngleCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','Bigger','THEN','Sub2','Moderate']
+        SubFIS2.Rules['AlmostNoCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['NoCurvature1'] = ['AND','BraidAngle','Small','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['OverCriticalCombAngleCurvature3'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['CriticalCombAngleCurvature2'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Moderate','THEN','Sub2','VeryHigh']
+        SubFIS2.Rules['CombAngleCurvature1'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
+        SubFIS2.Rules['AlmostNoCurvature2'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
+        SubFIS2.Rules['AlmostNoCurvature3'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['NoCurvature2'] = ['AND','BraidAngle','Moderatesmall','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['CriticalCombAngleCurvature3'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Small','THEN','Sub2','VeryHigh']
+        SubFIS2.Rules['CriticalCombAngleCurvature4'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Moderate','THEN','Sub2','High']
+        SubFIS2.Rules['CombAngleCurvature2'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
+        SubFIS2.Rules['AlmostNoCurvature4'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
+        SubFIS2.Rules['AlmostNoCurvature5'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['NoCurvature3'] = ['AND','BraidAngle','Moderate','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['OverCriticalCombAngleCurvature4'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['CriticalCombAngleCurvature5'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Moderate','THEN','Sub2','VeryHigh']
+        SubFIS2.Rules['CombAngleCurvature3'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
+        SubFIS2.Rules['AlmostNoCurvature6'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
+        SubFIS2.Rules['AlmostNoCurvature7'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['NoCurvature4'] = ['AND','BraidAngle','ModerateBig','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['OverCriticalCombAngleCurvature5'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['OverCriticalCombAngleCurvature6'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
+        SubFIS2.Rules['CriticalCombAngleCurvature6'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Big','THEN','Sub2','VeryHigh']
+        SubFIS2.Rules['ModerateCombAngleCurvature2'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','Bigger','THEN','Sub2','Moderate']
+        SubFIS2.Rules['AlmostNoCurvature8'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
+        SubFIS2.Rules['NoCurvature5'] = ['AND','BraidAngle','Big','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
 
         # Sub-FIS 3
         # ------------------------------------------------------------------- #
-        self.SubFIS3        = FIS(FISname='SubFIS3:CombinationYarnWidthAndRatioOfRadiusDiameter')
-        self.SubFIS3.Input  = dict()
-        self.SubFIS3.Output = dict()
-        self.SubFIS3.Rules  = dict()
+        SubFIS3        = FIS(FISname='SubFIS3:CombinationYarnWidthAndRatioOfRadiusDiameter')
+        SubFIS3.Input  = dict()
+        SubFIS3.Output = dict()
+        SubFIS3.Rules  = dict()
         # Input - Yarn width
-        self.SubFIS3.Input['YarnWidth'] = dict()
-        self.SubFIS3.Input['YarnWidth']['Range'] = [1.5, 4.0]
-        self.SubFIS3.Input['YarnWidth']['MF'] = dict()
-        self.SubFIS3.Input['YarnWidth']['MF']['TooSmall'] = Gauss2mf(.28, 1.0, .28, 1.5)
-        self.SubFIS3.Input['YarnWidth']['MF']['Small']    = Gaussmf(.28, 2.14)
-        self.SubFIS3.Input['YarnWidth']['MF']['Moderate'] = Gauss2mf(.28, 2.7, .28, 2.8)
-        self.SubFIS3.Input['YarnWidth']['MF']['Big']      = Gaussmf(.28, 3.36)
-        self.SubFIS3.Input['YarnWidth']['MF']['TooBig']   = Gauss2mf(.28, 4.0, .28, 4.5)
+        SubFIS3.Input['YarnWidth'] = dict()
+        SubFIS3.Input['YarnWidth']['Range'] = [1.5, 4.0]
+        SubFIS3.Input['YarnWidth']['MF'] = dict()
+        SubFIS3.Input['YarnWidth']['MF']['TooSmall'] = Gauss2mf(.28, 1.0, .28, 1.5)
+        SubFIS3.Input['YarnWidth']['MF']['Small']    = Gaussmf(.28, 2.14)
+        SubFIS3.Input['YarnWidth']['MF']['Moderate'] = Gauss2mf(.28, 2.7, .28, 2.8)
+        SubFIS3.Input['YarnWidth']['MF']['Big']      = Gaussmf(.28, 3.36)
+        SubFIS3.Input['YarnWidth']['MF']['TooBig']   = Gauss2mf(.28, 4.0, .28, 4.5)
         # Input - Ratio of radius to diameter
-        self.SubFIS3.Input['RadiusDiameterRatio'] = dict()
-        self.SubFIS3.Input['RadiusDiameterRatio']['Range'] = [0.5, 10.0]
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF'] = dict()
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF']['VerySmall'] = Gaussmf(.5, 0.0)
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF']['Small'] = Gaussmf(.5, 1.2)
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF']['Moderate'] = Gaussmf(.6, 2.4)
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF']['Big'] = Gaussmf(.7, 4.0)
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF']['Bigger'] = Gaussmf(.8, 6.0)
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF']['VeryBig'] = Gaussmf(.8, 7.8)
-        self.SubFIS3.Input['RadiusDiameterRatio']['MF']['NoCurvature'] = Gaussmf(.9, 10)
+        SubFIS3.Input['RadiusDiameterRatio'] = dict()
+        SubFIS3.Input['RadiusDiameterRatio']['Range'] = [0.5, 10.0]
+        SubFIS3.Input['RadiusDiameterRatio']['MF'] = dict()
+        SubFIS3.Input['RadiusDiameterRatio']['MF']['VerySmall'] = Gaussmf(.5, 0.0)
+        SubFIS3.Input['RadiusDiameterRatio']['MF']['Small'] = Gaussmf(.5, 1.2)
+        SubFIS3.Input['RadiusDiameterRatio']['MF']['Moderate'] = Gaussmf(.6, 2.4)
+        SubFIS3.Input['RadiusDiameterRatio']['MF']['Big'] = Gaussmf(.7, 4.0)
+        SubFIS3.Input['RadiusDiameterRatio']['MF']['Bigger'] = Gaussmf(.8, 6.0)
+        SubFIS3.Input['RadiusDiameterRatio']['MF']['VeryBig'] = Gaussmf(.8, 7.8)
+        SubFIS3.Input['RadiusDiameterRatio']['MF']['NoCurvature'] = Gaussmf(.9, 10)
         # Output - Sub3
-        self.SubFIS3.Output['Sub2'] = dict()
-        self.SubFIS3.Output['Sub2']['Range'] = [0, 1.0]
-        self.SubFIS3.Output['Sub2']['MF'] = dict()
-        self.SubFIS3.Output['Sub2']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
-        self.SubFIS3.Output['Sub2']['MF']['Low'] = Gaussmf(0.082, 0.1)
-        self.SubFIS3.Output['Sub2']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
-        self.SubFIS3.Output['Sub2']['MF']['High'] = Gaussmf(0.082, 0.4)
-        self.SubFIS3.Output['Sub2']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
-        self.SubFIS3.Output['Sub2']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
+        SubFIS3.Output['Sub2'] = dict()
+        SubFIS3.Output['Sub2']['Range'] = [0, 1.0]
+        SubFIS3.Output['Sub2']['MF'] = dict()
+        SubFIS3.Output['Sub2']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
+        SubFIS3.Output['Sub2']['MF']['Low'] = Gaussmf(0.082, 0.1)
+        SubFIS3.Output['Sub2']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
+        SubFIS3.Output['Sub2']['MF']['High'] = Gaussmf(0.082, 0.4)
+        SubFIS3.Output['Sub2']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
+        SubFIS3.Output['Sub2']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
         # Rules Sub-FIS3
-        self.SubFIS3.Rules['CurvatureTooGreatOverCompact'] = ['OR','YarnWidth','TooSmall','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
-        self.SubFIS3.Rules['CurvatureTooGreatBraidOpen'] = ['OR','YarnWidth','TooBig','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
-        self.SubFIS3.Rules['OverCriticalCombAngleCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
-        self.SubFIS3.Rules['OverCriticalCombAngleCurvature2'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
-        self.SubFIS3.Rules['CriticalCombAngleCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Big','THEN','Sub2','High']
-        self.SubFIS3.Rules['LowCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
-        self.SubFIS3.Rules['LowCurvature2'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','VeryBig','THEN','Sub2','Low']
-        self.SubFIS3.Rules['NoCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
-        self.SubFIS3.Rules['OverCriticalCombAngleCurvature3'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Small','THEN','Sub2','VeryHigh']
-        self.SubFIS3.Rules['CriticalCombAngleCurvature2'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Moderate','THEN','Sub2','High']
-        self.SubFIS3.Rules['ModerateCurvature1'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
-        self.SubFIS3.Rules['LowCurvature3'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
-        self.SubFIS3.Rules['NoCurvature2'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
-        self.SubFIS3.Rules['NoCurvature3'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
-        self.SubFIS3.Rules['OverCriticalCombAngleCurvature4'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
-        self.SubFIS3.Rules['OverCriticalCombAngleCurvature5'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
-        self.SubFIS3.Rules['CriticalCombAngleCurvature3'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Big','THEN','Sub2','High']
-        self.SubFIS3.Rules['LowCurvature4'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
-        self.SubFIS3.Rules['LowCurvature5'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','VeryBig','THEN','Sub2','Low']
-        self.SubFIS3.Rules['NoCurvature4'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS3.Rules['CurvatureTooGreatOverCompact'] = ['OR','YarnWidth','TooSmall','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
+        SubFIS3.Rules['CurvatureTooGreatBraidOpen'] = ['OR','YarnWidth','TooBig','RadiusDiameterRatio','VerySmall','THEN','Sub2','NotManufacturable']
+        SubFIS3.Rules['OverCriticalCombAngleCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
+        SubFIS3.Rules['OverCriticalCombAngleCurvature2'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
+        SubFIS3.Rules['CriticalCombAngleCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Big','THEN','Sub2','High']
+        SubFIS3.Rules['LowCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
+        SubFIS3.Rules['LowCurvature2'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','VeryBig','THEN','Sub2','Low']
+        SubFIS3.Rules['NoCurvature1'] = ['AND','YarnWidth','Small','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS3.Rules['OverCriticalCombAngleCurvature3'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Small','THEN','Sub2','VeryHigh']
+        SubFIS3.Rules['CriticalCombAngleCurvature2'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Moderate','THEN','Sub2','High']
+        SubFIS3.Rules['ModerateCurvature1'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Big','THEN','Sub2','Moderate']
+        SubFIS3.Rules['LowCurvature3'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
+        SubFIS3.Rules['NoCurvature2'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','VeryBig','THEN','Sub2','VeryLow']
+        SubFIS3.Rules['NoCurvature3'] = ['AND','YarnWidth','Moderate','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
+        SubFIS3.Rules['OverCriticalCombAngleCurvature4'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Small','THEN','Sub2','NotManufacturable']
+        SubFIS3.Rules['OverCriticalCombAngleCurvature5'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Moderate','THEN','Sub2','NotManufacturable']
+        SubFIS3.Rules['CriticalCombAngleCurvature3'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Big','THEN','Sub2','High']
+        SubFIS3.Rules['LowCurvature4'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','Bigger','THEN','Sub2','Low']
+        SubFIS3.Rules['LowCurvature5'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','VeryBig','THEN','Sub2','Low']
+        SubFIS3.Rules['NoCurvature4'] = ['AND','YarnWidth','Big','RadiusDiameterRatio','NoCurvature','THEN','Sub2','VeryLow']
 
         # MAIN-FIS
         # ------------------------------------------------------------------- #
-        self.MainFIS        = FIS(FISname='Manufacturing Effort Model For Braiding',AndMethod='min')
-        self.MainFIS.Input  = dict()
-        self.MainFIS.Output = dict()
-        self.MainFIS.Rules  = dict()
+        MainFIS        = FIS(FISname='Manufacturing Effort Model For Braiding',AndMethod='min')
+        MainFIS.Input  = dict()
+        MainFIS.Output = dict()
+        MainFIS.Rules  = dict()
         # Input - Sub1
-        self.MainFIS.Input['Sub1'] = dict()
-        self.MainFIS.Input['Sub1']['Range'] = [0.0, 1.0]
-        self.MainFIS.Input['Sub1']['MF'] = dict()
-        self.MainFIS.Input['Sub1']['MF']['Good'] = Trimf(-1.0, 0.0, 1.0)
-        self.MainFIS.Input['Sub1']['MF']['Bad']  = Trimf(0.0, 1.0, 2.0)
-        self.MainFIS.Input['Sub1']['MF']['Any']  = Const(1.0)
+        MainFIS.Input['Sub1'] = dict()
+        MainFIS.Input['Sub1']['Range'] = [0.0, 1.0]
+        MainFIS.Input['Sub1']['MF'] = dict()
+        MainFIS.Input['Sub1']['MF']['Good'] = Trimf(-1.0, 0.0, 1.0)
+        MainFIS.Input['Sub1']['MF']['Bad']  = Trimf(0.0, 1.0, 2.0)
+        MainFIS.Input['Sub1']['MF']['Any']  = Const(1.0)
         # Input - Sub2
-        self.MainFIS.Input['Sub2'] = dict()
-        self.MainFIS.Input['Sub2']['Range'] = [0.0, 1.0]
-        self.MainFIS.Input['Sub2']['MF'] = dict()
-        self.MainFIS.Input['Sub2']['MF']['Good'] = Trimf(-1.0, 0.0, 1.0)
-        self.MainFIS.Input['Sub2']['MF']['Bad']  = Trimf(0.0, 1.0, 2.0)
-        self.MainFIS.Input['Sub2']['MF']['Any']  = Const(1.0)
+        MainFIS.Input['Sub2'] = dict()
+        MainFIS.Input['Sub2']['Range'] = [0.0, 1.0]
+        MainFIS.Input['Sub2']['MF'] = dict()
+        MainFIS.Input['Sub2']['MF']['Good'] = Trimf(-1.0, 0.0, 1.0)
+        MainFIS.Input['Sub2']['MF']['Bad']  = Trimf(0.0, 1.0, 2.0)
+        MainFIS.Input['Sub2']['MF']['Any']  = Const(1.0)
         # Input - Sub3
-        self.MainFIS.Input['Sub3'] = dict()
-        self.MainFIS.Input['Sub3']['Range'] = [0.0, 1.0]
-        self.MainFIS.Input['Sub3']['MF'] = dict()
-        self.MainFIS.Input['Sub3']['MF']['Good'] = Trimf(-1.0, 0.0, 1.0)
-        self.MainFIS.Input['Sub3']['MF']['Bad']  = Trimf(0.0, 1.0, 2.0)
-        self.MainFIS.Input['Sub3']['MF']['Any']  = Const(1.0)
+        MainFIS.Input['Sub3'] = dict()
+        MainFIS.Input['Sub3']['Range'] = [0.0, 1.0]
+        MainFIS.Input['Sub3']['MF'] = dict()
+        MainFIS.Input['Sub3']['MF']['Good'] = Trimf(-1.0, 0.0, 1.0)
+        MainFIS.Input['Sub3']['MF']['Bad']  = Trimf(0.0, 1.0, 2.0)
+        MainFIS.Input['Sub3']['MF']['Any']  = Const(1.0)
         # Input - Edge radius
-        self.MainFIS.Input['EdgeRadius'] = dict()
-        self.MainFIS.Input['EdgeRadius']['Range'] = [3.0, 5.0]
-        self.MainFIS.Input['EdgeRadius']['MF'] = dict()
-        self.MainFIS.Input['EdgeRadius']['MF']['TooSmall'] = Pimf(1.0, 2.8, 2.9, 5.1)
-        self.MainFIS.Input['EdgeRadius']['MF']['Moderate'] = Pimf(2.9, 5.1, 5.317, 6.8)
-        self.MainFIS.Input['EdgeRadius']['MF']['Any']      = Const(1.0)
+        MainFIS.Input['EdgeRadius'] = dict()
+        MainFIS.Input['EdgeRadius']['Range'] = [3.0, 5.0]
+        MainFIS.Input['EdgeRadius']['MF'] = dict()
+        MainFIS.Input['EdgeRadius']['MF']['TooSmall'] = Pimf(1.0, 2.8, 2.9, 5.1)
+        MainFIS.Input['EdgeRadius']['MF']['Moderate'] = Pimf(2.9, 5.1, 5.317, 6.8)
+        MainFIS.Input['EdgeRadius']['MF']['Any']      = Const(1.0)
         # Input - Aspect ratio
-        self.MainFIS.Input['AspectRatio'] = dict()
-        self.MainFIS.Input['AspectRatio']['Range'] = [2.0, 4.0]
-        self.MainFIS.Input['AspectRatio']['MF'] = dict()
-        self.MainFIS.Input['AspectRatio']['MF']['Moderate'] = Pimf(0.0, 1.8, 1.9, 4.1)
-        self.MainFIS.Input['AspectRatio']['MF']['TooBig']   = Pimf(1.9, 4.1, 4.317, 5.8)
-        self.MainFIS.Input['AspectRatio']['MF']['Any']      = Const(1.0)
+        MainFIS.Input['AspectRatio'] = dict()
+        MainFIS.Input['AspectRatio']['Range'] = [2.0, 4.0]
+        MainFIS.Input['AspectRatio']['MF'] = dict()
+        MainFIS.Input['AspectRatio']['MF']['Moderate'] = Pimf(0.0, 1.8, 1.9, 4.1)
+        MainFIS.Input['AspectRatio']['MF']['TooBig']   = Pimf(1.9, 4.1, 4.317, 5.8)
+        MainFIS.Input['AspectRatio']['MF']['Any']      = Const(1.0)
         # Input - Number of plies
-        self.MainFIS.Input['PlyNum'] = dict()
-        self.MainFIS.Input['PlyNum']['Range'] = [5.0, 20.]
-        self.MainFIS.Input['PlyNum']['MF'] = dict()
-        self.MainFIS.Input['PlyNum']['MF']['Few']     = Pimf(-16.9, -.1, 4.1, 20.9 )
-        self.MainFIS.Input['PlyNum']['MF']['TooMany'] = Pimf(4.1, 20.9, 25.1, 41.9)
-        self.MainFIS.Input['PlyNum']['MF']['Any']     = Const(1.0)
+        MainFIS.Input['PlyNum'] = dict()
+        MainFIS.Input['PlyNum']['Range'] = [5.0, 20.]
+        MainFIS.Input['PlyNum']['MF'] = dict()
+        MainFIS.Input['PlyNum']['MF']['Few']     = Pimf(-16.9, -.1, 4.1, 20.9 )
+        MainFIS.Input['PlyNum']['MF']['TooMany'] = Pimf(4.1, 20.9, 25.1, 41.9)
+        MainFIS.Input['PlyNum']['MF']['Any']     = Const(1.0)
         # Input - Number of UD-patches
-        self.MainFIS.Input['PatchNum'] = dict()
-        self.MainFIS.Input['PatchNum']['Range'] = [0.0, 5.]
-        self.MainFIS.Input['PatchNum']['MF'] = dict()
-        self.MainFIS.Input['PatchNum']['MF']['Few']     = Pimf(-7.3, -1.7, -0.3, 5.3)
-        self.MainFIS.Input['PatchNum']['MF']['TooMany'] = Pimf(-.3, 5.3, 6.7, 12.3)
-        self.MainFIS.Input['PatchNum']['MF']['Any']     = Const(1.0)
+        MainFIS.Input['PatchNum'] = dict()
+        MainFIS.Input['PatchNum']['Range'] = [0.0, 5.]
+        MainFIS.Input['PatchNum']['MF'] = dict()
+        MainFIS.Input['PatchNum']['MF']['Few']     = Pimf(-7.3, -1.7, -0.3, 5.3)
+        MainFIS.Input['PatchNum']['MF']['TooMany'] = Pimf(-.3, 5.3, 6.7, 12.3)
+        MainFIS.Input['PatchNum']['MF']['Any']     = Const(1.0)
         # Output - Manufacturing effort
-        self.MainFIS.Output['ME'] = dict()
-        self.MainFIS.Output['ME']['Range'] = [0, 1.0]
-        self.MainFIS.Output['ME']['MF'] = dict()
-        self.MainFIS.Output['ME']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
-        self.MainFIS.Output['ME']['MF']['Low'] = Gaussmf(0.082, 0.1)
-        self.MainFIS.Output['ME']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
-        self.MainFIS.Output['ME']['MF']['High'] = Gaussmf(0.082, 0.4)
-        self.MainFIS.Output['ME']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
-        self.MainFIS.Output['ME']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
+        MainFIS.Output['ME'] = dict()
+        MainFIS.Output['ME']['Range'] = [0, 1.0]
+        MainFIS.Output['ME']['MF'] = dict()
+        MainFIS.Output['ME']['MF']['VeryLow'] = Gaussmf(0.082, 0.0)
+        MainFIS.Output['ME']['MF']['Low'] = Gaussmf(0.082, 0.1)
+        MainFIS.Output['ME']['MF']['Moderate'] = Gaussmf(0.082, 0.2)
+        MainFIS.Output['ME']['MF']['High'] = Gaussmf(0.082, 0.4)
+        MainFIS.Output['ME']['MF']['VeryHigh'] = Gaussmf(0.082, 0.8)
+        MainFIS.Output['ME']['MF']['NotManufacturable'] = Gaussmf(0.082, 1.0)
         # Rules Sub-FIS3
-        self.MainFIS.Rules['AllGood'] = ['AND','Sub1','Good','Sub2','Good','Sub3','Good','EdgeRadius','Moderate','AspectRatio','Moderate','PlyNum','Few','PatchNum','Few','THEN','ME','VeryLow']
-        self.MainFIS.Rules['AllBad'] = ['OR','Sub1','Bad','Sub2','Bad','Sub3','Bad','EdgeRadius','TooSmall','AspectRatio','TooBig','PlyNum','TooMany','PatchNum','TooMany','THEN','ME','NotManufacturable']
+        MainFIS.Rules['AllGood'] = ['AND','Sub1','Good','Sub2','Good','Sub3','Good','EdgeRadius','Moderate','AspectRatio','Moderate','PlyNum','Few','PatchNum','Few','THEN','ME','VeryLow']
+        MainFIS.Rules['AllBad'] = ['OR','Sub1','Bad','Sub2','Bad','Sub3','Bad','EdgeRadius','TooSmall','AspectRatio','TooBig','PlyNum','TooMany','PatchNum','TooMany','THEN','ME','NotManufacturable']
+        # Compile BraidFIS for evaluation
+        # ------------------------------------------------------------------- #
+        BraidFIS = [SubFIS1, SubFIS2, SubFIS3, MainFIS]
+        for iFIS in BraidFIS:
+            iFIS.Compile()
+        return BraidFIS
 
-        # Store BraidFIS
+    def CreateAndSaveBraidFIS(self):
+        # Load BraidFIS from class-wide template (rebuilt only if outdated)
         # ------------------------------------------------------------------- #
-        self.BraidFIS = [self.SubFIS1,self.SubFIS2,self.SubFIS3,self.MainFIS]
-        pickle.dump(self.BraidFIS,open(self.CurPath+'/BraidFIS.p','wb'))
+        self.BraidFIS = pickle.loads(self._BuildOrLoadTemplate(self.CurPath))
+        [self.SubFIS1, self.SubFIS2, self.SubFIS3, self.MainFIS] = self.BraidFIS
+        self._InternRuleNames()
+        # Cached sections and responses refer to the previous FIS
+        self._Memo.clear()
 
         # Store optimal values
         # ------------------------------------------------------------------- #
@@ -371,8 +475,8 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         self.FISExtremalMaxInput['AspectRatio']           = 4.
         self.FISExtremalMaxInput['PlyNum']                = 20.
         self.FISExtremalMaxInput['PatchNum']              = self.MaxPatches
-        self.FISxMinInputList = [25., 2.7, 10., 3., 2.,  5., 0.]
-        self.FISxMaxInputList = [75., 4.,   0., 5., 4., 20., self.MaxPatches]
+        self.FISxMinInputList = np.array([25., 2.7, 10., 3., 2.,  5., 0.])
+        self.FISxMaxInputList = np.array([75., 4.,   0., 5., 4., 20., self.MaxPatches])
 
         # Store elaboration hints
         # ------------------------------------------------------------------- #
@@ -459,13 +563,42 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         Hint = 'Reduce number of UD patches {1}'
         ElaborationHints[Hint] = {'Rule': ['AllBad'], \
             'VerbalVariable': ['PatchNum']}
+        # Store rules and verbal variables as sets for O(1) membership tests
+        for iHint in ElaborationHints.keys():
+            ElaborationHints[iHint]['Rule'] = frozenset(map(sys.intern, ElaborationHints[iHint]['Rule']))
+            ElaborationHints[iHint]['VerbalVariable'] = frozenset(map(sys.intern, \
+                ElaborationHints[iHint]['VerbalVariable']))
         self._ElaborationHints = ElaborationHints
+        # Inverted index (rule, verbal variable) -> first matching hint
+        self._HintIndex = dict()
+        for iHint in ElaborationHints.keys():
+            for iRule in ElaborationHints[iHint]['Rule']:
+                for iVar in ElaborationHints[iHint]['VerbalVariable']:
+                    self._HintIndex.setdefault((iRule, iVar), iHint)
+
+    def _InternRuleNames(self):
+        '''
+        Interns rule and variable names of the unpickled FIS, such that the hint
+        lookup of the reasoning compares names by identity
+        - the compiled rule keys, which the reasoning returns, are rebuilt from
+          the interned names
+        '''
+        for iFIS in self.BraidFIS:
+            for RuleDef in iFIS.Rules.values():
+                RuleDef[:] = [sys.intern(iStr) for iStr in RuleDef]
+            iFIS.Rules = type(iFIS.Rules)((sys.intern(iRule), RuleDef) for (iRule, RuleDef) in iFIS.Rules.items())
+            if iFIS._Compiled:
+                iFIS._RuleKeys = list(iFIS.Rules.keys())
+                iFIS._InpPerRuleVals = None
 
     def LoadBraidFIS(self,FileName='BraidFIS',Path=[]):
         if not Path:
             Path = self.CurPath
-        self.BraidFIS = pickle.load(open(Path+'/'+FileName+'.p','rb') )
-    def _WriteXinDict(self,x):
+        with open(os.path.join(Path, FileName+'.p'), 'rb') as FISFile:
+            self.BraidFIS = pickle.load(FISFile)
+        self._InternRuleNames()
+        self._Memo.clear()
+    def _XinDict(self,x):
         # Map input
         # ------------------------------------------------------------------- #
         InVals                         = dict()
@@ -476,97 +609,92 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         InVals['AspectRatio']          = x[4]   # [-]   ... [2 4]    -> 2
         InVals['PlyNum']               = x[5]   # [-]   ... [5 20]   -> 5
         InVals['PatchNum']             = x[6]*5./self.MaxPatches # [-]   ... [0 MaxPatches]    -> 0
-        self.InVals                    = InVals
+        return InVals
+    def _WriteXinDict(self,x):
+        # Update the preallocated input dict in place
+        InVals                         = self.InVals
+        InVals['BraidAngle']           = x[0]
+        InVals['YarnWidth']            = x[1]
+        InVals['RadiusDiameterRatio']  = x[2]
+        InVals['EdgeRadius']           = x[3]
+        InVals['AspectRatio']          = x[4]
+        InVals['PlyNum']               = x[5]
+        InVals['PatchNum']             = x[6]*5./self.MaxPatches
+    def _SectionInputs(self,x):
+        '''
+        Maps a dict input to the 7-vectors of FIS inputs of all profile sections
+        '''
+        UList = x['ProfileCircumferences']
+        PhiList = x['BraidingAngle']
+        nSections = min(len(UList), len(PhiList))
+        UArr = np.asarray(UList[:nSections], dtype=np.float64)
+        PhiArr = np.asarray(PhiList[:nSections], dtype=np.float64)
+        if 'PathRadii' in x.keys():
+            RArr = np.asarray(x['PathRadii'], dtype=np.float64)
+            if len(x['PathRadii'])!=len(x['BraidingAngle']):
+                # Smaller radius of adjacent path points
+                PR = RArr
+                RArr = np.empty(PR.size+1)
+                (RArr[0], RArr[-1]) = (PR[0], PR[-1])
+                np.minimum(PR[:-1], PR[1:], out=RArr[1:-1])
+            nRD = min(len(RArr), nSections)
+            RD = RArr[:nRD]/(UArr[:nRD]/np.pi)
+        else:
+            RD = 10.
+        # Columns of the FIS inputs, missing entries are constant defaults
+        Columns = [PhiArr, self.ComputeYarnWidth(UArr, PhiArr), RD, x.get('ProfileMinRadius', 5.), \
+            x.get('ProfileAspect', 2.), x.get('PlyNum', 5.), x.get('PatchNum', 0.)]
+        # Sections are limited by the shortest given entry
+        nSections = min([nSections]+[len(iCol) for iCol in Columns if np.ndim(iCol)])
+        XSections = np.empty((nSections, len(Columns)))
+        for (iCol, Col) in enumerate(Columns):
+            XSections[:, iCol] = Col if np.ndim(Col)==0 else np.asarray(Col[:nSections], dtype=np.float64)
+        return XSections.tolist()
+    @staticmethod
+    def _TrapezoidalME(MEList,lList):
+        # Path length weighted mean of the section MEs, path lengths beyond the
+        # last pair of sections (or vice versa) are ignored
+        MEArr = np.asarray(MEList, dtype=np.float64)
+        lArr = np.asarray(lList, dtype=np.float64)
+        n = max(0, min(lArr.size, MEArr.size-1))
+        # Slices are views, so no temporary copies of the section MEs are made
+        return float(0.5*(np.dot(lArr[:n], MEArr[1:n+1])+np.dot(lArr[:n], MEArr[:n]))/lArr.sum())
     def __call__(self,x):
         if isinstance(x, dict):
-            UList = x['ProfileCircumferences']
-            PhiList = x['BraidingAngle']
-            lList = x['PathLength']
-            bList = list()
-            for (iU, iPhi) in zip(UList, PhiList):
-                bList.append(self.ComputeYarnWidth(iU,iPhi))
-            if 'ProfileMinRadius' in x.keys():
-                rList = x['ProfileMinRadius']
-            else:
-                rList = [5.]*len(UList)
-            if 'PathRadii' in x.keys():
-                if len(x['PathRadii'])==len(x['BraidingAngle']):
-                    RList = x['PathRadii']
-                else:
-                    RList = list()
-                    RList.append(x['PathRadii'][0])
-                    for (ix0, ix1) in zip(x['PathRadii'][:-1], x['PathRadii'][1:]):
-                        RList.append(min(ix0,ix1))
-                    RList.append(x['PathRadii'][-1])
-                RDList = list()
-                for (R, u) in zip(RList, UList):
-                    RDList.append(R/(u/np.pi))
-            else:
-                RDList = [10.]*len(UList)
-            if 'ProfileAspect' in x.keys():
-                abList = x['ProfileAspect']
-            else:
-                abList = [2.]*len(UList)
-            if 'PlyNum' in x.keys():
-                plyNumList = x['PlyNum']
-            else:
-                plyNumList = [5.]*len(UList)
-            if 'PatchNum' in x.keys():
-                patchNumList = x['PatchNum']
-            else:
-                patchNumList = [0.]*len(UList)
-            if 'SupPathRadii' in x.keys():
-                RSupList = x['SupPathRadii']
+            return self._EvalProfile(x)
+        return self._ComputeME(x)
 
-            (MEList, MEReasonList, MEHintList) = (list(), list(), list())
-            xList = list()
-            for (iPhi, ib, iRD, ir, iab, iPlyNum, iPatch) in zip(PhiList, bList, RDList, rList, abList, plyNumList, patchNumList):
-                x = cp.deepcopy([iPhi, ib, iRD, ir, iab, iPlyNum, iPatch])
-                MEList.append(self._ComputeME(x))
-                MEReasonList.append(self.Reasoning())
-                MEHintList.append(self.ElaborationHints())
-                xList.append(x)
-            self.MEList = MEList
-            self.xList = xList
-            self.MEReasonList = MEReasonList
-            self.MEHintList = MEHintList
-
-            METrap = 0.
-            for (iL, iMEb, iMEa) in zip(lList, MEList[1:], MEList[:-1]):
-                METrap += iL/2*(iMEa+iMEb)
-            METrap /= sum(lList)
-            return METrap
-        else:
-            return self._ComputeME(x)
+    def _EvalProfile(self,x):
+        '''
+        Path length weighted ME of all profile sections of a dict input
+        '''
+        (MEList, MEReasonList, MEHintList) = (list(), list(), list())
+        xList = self._SectionInputs(x)
+        for (iSection, xSection) in enumerate(xList):
+            # Last section is always evaluated, so FIS states refer to it
+            (ME, Reason, Hint) = self._ComputeSection(xSection, UseCache=iSection < len(xList)-1)
+            MEList.append(ME)
+            MEReasonList.append(Reason)
+            MEHintList.append(Hint)
+        self.MEList = MEList
+        self.xList = xList
+        self.MEReasonList = MEReasonList
+        self.MEHintList = MEHintList
+        return self._TrapezoidalME(MEList, x['PathLength'])
 
     def _ComputeME(self,x):
         # Initializations
         # ------------------------------------------------------------------- #
-        yL = [15, 1.5,  0., 3., 2.,  5., 0.]
-        yU = [75,  4., 10., 5., 4., 20., 5.]
-        (MEmin, MEmax) = (0.1, 1.1)
-        #      Phi,   b,     R/D,   r,     a/b,   Ply#,  Patch#
-        y0  = [   0.,   0.1,    0.,   0.1, -1000, -40.0,    0.]
-        ME0 = [MEmax, MEmax, MEmax, MEmax, MEmin, MEmin, MEmin]
-        y1  = [  90.,  10.0, 1.0e6, 1.0e6, 1.0e3, 100.0,   50.]
-        ME1 = [MEmax, MEmax, MEmin, MEmin, MEmax, MEmax, MEmax]
+        (yL, yU, y0, ME0, y1, ME1) = (self.yL, self.yU, self.y0, self.ME0, self.y1, self.ME1)
         # Conduct bound check
         # ------------------------------------------------------------------- #
-        xOrg = list()
-        BoundViolation = False
-        for (iX, iyL, iyU) in zip(x, yL, yU):
-            if (iX < iyL) or (iX > iyU):
-                BoundViolation = True
-                if (iX < iyL):
-                    xOrg.append(iyL)
-                else:
-                    xOrg.append(iyU)
-            else:
-                xOrg.append(iX)
+        xArr = np.asarray(x, dtype=np.float64)
+        xOrg = np.empty_like(xArr)
+        (_, BoundViolation) = _BoundCheck(xArr, yL, yU, y0, ME0, y1, ME1, 0., False, xOrg)
 
         # Compute FIS response at bound
         # ------------------------------------------------------------------- #
-        self._WriteXinDict(xOrg)
+        self._WriteXinDict(xOrg.tolist())
         self.InVals['Sub1']            = self.BraidFIS[0].EvalFIS(self.InVals)
         self.InVals['Sub2']            = self.BraidFIS[1].EvalFIS(self.InVals)
         self.InVals['Sub3']            = self.BraidFIS[2].EvalFIS(self.InVals)
@@ -575,16 +703,70 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         # Bound has been violated
         # ------------------------------------------------------------------- #
         if BoundViolation:
-            MEReturn = MEOrg
-            for (iX, iyL, iyU, iy0, iy1, iME0, iME1) in zip(x, yL, yU, y0, y1, ME0, ME1):
-                if (iX < iyL):
-                    MEReturn += (iME0-MEOrg)/(iy0-iyL)*(iX-iyL)
-                elif (iX > iyU):
-                    MEReturn += (iME1-MEOrg)/(iy1-iyU)*(iX-iyU)
-            return MEReturn
+            with np.errstate(divide='ignore', invalid='ignore'):
+                (MEReturn, _) = _BoundCheck(xArr, yL, yU, y0, ME0, y1, ME1, MEOrg, True, xOrg)
+            return float(MEReturn)
         else:
             return MEOrg
 
+    def _ComputeMEGrad(self,x):
+        '''
+        Analytic gradient of ME at x, needs the FIS states of _ComputeME(x)
+        - right-sided like the forward differences, i.e. x at the upper bound
+          is extrapolated
+        '''
+        x = np.asarray(x, dtype=np.float64)
+        (yL, yU) = (self.yL, self.yU)
+        # Chain rule through the FIS hierarchy, input gradients are unit vectors
+        # ------------------------------------------------------------------- #
+        Grad = self._XinDict(np.eye(x.size))
+        for (iFIS, iName) in zip(self.BraidFIS, ['Sub1', 'Sub2', 'Sub3', 'ME']):
+            dFIS = iFIS.GradFIS()
+            Grad[iName] = sum([dFIS[iInput]*Grad[iInput] for iInput in dFIS.keys()])
+        # Linear extrapolation beyond bounds: ME = MEOrg+sum(Slope*(x-Bound))
+        # ------------------------------------------------------------------- #
+        (Low, High) = (x < yL, x >= yU)
+        MEOrg = self.BraidFIS[3].FISValue
+        with np.errstate(divide='ignore', invalid='ignore'):    # y0 equals yL for R/D and Patch#
+            Slope = np.where(Low, (self.ME0-MEOrg)/(self.y0-yL), \
+                np.where(High, (self.ME1-MEOrg)/(self.y1-yU), 0.))
+            Frac = np.where(Low, (x-yL)/(self.y0-yL), \
+                np.where(High, (x-yU)/(self.y1-yU), 0.))
+        return np.where(Low | High, 0., Grad['ME'])*(1.-np.sum(Frac))+Slope
+    def ComputeResponseBatch(self,X,Dtype=np.float64):
+        '''
+        Computes the manufacturing effort for an array of inputs (points x 7) in one pass
+        - Dtype is the precision of the FIS evaluation (see FIS.EvalFISBatch)
+        '''
+        X = np.atleast_2d(np.asarray(X, dtype=np.float64))
+        (yL, yU) = (self.yL, self.yU)
+        # Compute FIS response at bound
+        # ------------------------------------------------------------------- #
+        InVals = self._XinDict(np.clip(X, yL, yU).T)
+        InVals['Sub1'] = self.BraidFIS[0].EvalFISBatch(InVals, Dtype)
+        InVals['Sub2'] = self.BraidFIS[1].EvalFISBatch(InVals, Dtype)
+        InVals['Sub3'] = self.BraidFIS[2].EvalFISBatch(InVals, Dtype)
+        MEOrg = self.BraidFIS[3].EvalFISBatch(InVals, Dtype)
+        # Linear extrapolation on the rows where bounds have been violated
+        # ------------------------------------------------------------------- #
+        (LowMask, HighMask) = (X < yL, X > yU)
+        iViolated = np.flatnonzero(np.any(LowMask | HighMask, axis=1))
+        if iViolated.size==0:
+            return MEOrg
+        (XV, MEV) = (X[iViolated], MEOrg[iViolated, np.newaxis])
+        with np.errstate(divide='ignore', invalid='ignore'):    # y0 equals yL for R/D and Patch#
+            Low = np.where(LowMask[iViolated], (self.ME0-MEV)/(self.y0-yL)*(XV-yL), 0.)
+        High = np.where(HighMask[iViolated], (self.ME1-MEV)/(self.y1-yU)*(XV-yU), 0.)
+        MEOrg[iViolated] += np.sum(Low+High, axis=1)
+        return MEOrg
+    def _ResponseSurfaces(self,xList,Axes,X,Y):
+        # Responses on the grid (X,Y) spanned by inputs Axes, other inputs from
+        # each x in xList, all surfaces in one batch (surfaces x grid)
+        XGrid = np.repeat(np.asarray(xList, dtype=np.float64)[:, np.newaxis, :], X.size, axis=1)
+        XGrid[:, :, Axes[0]] = X.ravel()
+        XGrid[:, :, Axes[1]] = Y.ravel()
+        ZGrid = self.ComputeResponseBatch(XGrid.reshape(-1, XGrid.shape[-1]), np.float32)
+        return ZGrid.reshape((len(xList),)+X.shape)
     def VarInfo(self):
         VarInfoStr = '# BraidAngle [Deg] ... [15 75]) -> 25\n'
         VarInfoStr = VarInfoStr+'# YarnWidth  [mm]  ... [1.5 4]  -> 2.7\n'
@@ -596,26 +778,72 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         self.VarInfoStr
         return self.VarInfoStr
 
+    def _MemoKey(self,Kind,x):
+        # Quantize input such that inputs closer than 10*FDTol share one entry
+        return (Kind,)+tuple(int(round(ix/(10.0*self.FDTol))) for ix in x)
+
+    def _MemoStore(self,Key,Value):
+        self._Memo[Key] = Value
+        if len(self._Memo) > self.MemoSize:
+            self._Memo.popitem(last=False)
+        return Value
+
+    def _ComputeSection(self,x,UseCache=True):
+        '''
+        ME, reasoning and hint of one profile section, cached by the exact input
+        - finite differences of dict inputs change one section at a time, all
+          other sections are taken from the cache
+        '''
+        Key = ('Section',)+tuple(x)
+        if UseCache and (Key in self._Memo):
+            self._Memo.move_to_end(Key)
+            return self._Memo[Key]
+        ME = self._ComputeME(x)
+        return self._MemoStore(Key, (ME, self.Reasoning(), self.ElaborationHints()))
+
     def ComputeResponse(self,x):
-        return self(x)
+        '''
+        Computes ME, using the fuzzy memoization if UseFuzzyMemo is set
+        - Reasoning() always refers to the last input actually evaluated
+        '''
+        if (not self.UseFuzzyMemo) or isinstance(x, dict):
+            return self(x)
+        Key = self._MemoKey('ME', x)
+        if Key in self._Memo:
+            self._Memo.move_to_end(Key)
+            return self._Memo[Key]
+        return self._MemoStore(Key, self(x))
 
     def ComputeRespAndSens(self,x):
         '''
         Computes sensitivities!
         - if x is a dict, than all sensitivities need be passed with SENS attached to key
         - returns: ME, MEsens, Reason (if dict, than last one is a list!)
+        - uses the fuzzy memoization for list inputs if UseFuzzyMemo is set, the
+          memo holds a tuple and every call returns its own copy of MEsens
         '''
+        if (not self.UseFuzzyMemo) or isinstance(x, dict):
+            return self._ComputeRespAndSens(x)
+        Key = self._MemoKey('Sens', x)
+        if Key in self._Memo:
+            self._Memo.move_to_end(Key)
+            (ME, MEsens, Reason) = self._Memo[Key]
+        else:
+            (ME, MEsens, Reason) = self._ComputeRespAndSens(x)
+            self._MemoStore(Key, (ME, np.array(MEsens), Reason))
+        return [ME, np.array(MEsens), Reason]
+
+    def _ComputeRespAndSens(self,x):
         if isinstance(x, dict):
             # Initializations
             # --------------------------------------------------------------- #
             SupportedDictEntries = self.SupportDictKeys
             try:
                 nDV = np.size(x['BraidingAngleSENS'][0])
-            except:
+            except Exception:
                 ErrorMSG = 'No sensitivities in input dictionary or wrong defined!'
                 print(ErrorMSG)
                 sys.exit(ErrorMSG)
-                return ErrorMSG
             MEsens = np.zeros(np.shape(x['BraidingAngleSENS'][0]))
             (RespKeys, SensKeys) = (list(), list())
             for iKey in x.keys():
@@ -627,14 +855,13 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
             '''
             if len(RespKeys)!=len(SensKeys):
                 ErrorMSG = 'Not all sensitivities via SENS are given!'
-                print ErrorMSG
+                print(ErrorMSG)
                 sys.exit(ErrorMSG)
-                return ErrorMSG
             '''
 
             # Compute and store base results
             # --------------------------------------------------------------- #
-            MEorg = self(x)
+            MEorg = self._EvalProfile(x)
             MEList = self.MEList
             xList = self.xList
             MEReasonList = self.MEReasonList
@@ -642,11 +869,32 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
 
             # Compute FIS sensitivities
             # --------------------------------------------------------------- #
-            for DictKey in SensKeys:
+            if self.AnalyticSens:
+                # Analytic gradient of each section ME w.r.t. its FIS inputs,
+                # the last section is evaluated last so FIS states refer to it
+                SectionGrads = list()
+                for ix in xList:
+                    self._ComputeME(ix)
+                    SectionGrads.append(self._ComputeMEGrad(ix))
+                (MEArr, XArr, SectionGrads) = (np.array(MEList), np.array(xList), np.array(SectionGrads))
+            # Only the sections whose FIS inputs change are evaluated again,
+            # or with analytic gradients only the input mapping is differenced
+            for DictKey in RespKeys:
+                if DictKey+'SENS' not in SensKeys:
+                    continue
                 for iME in range(len(x[DictKey])):
-                    MEInp = cp.deepcopy(x)
+                    # Copy only the perturbed list
+                    MEInp = dict(x)
+                    MEInp[DictKey] = list(x[DictKey])
                     MEInp[DictKey][iME] += self.FDTol
-                    MEsens += ((self(MEInp)-MEorg)/self.FDTol)*x[DictKey+'SENS'][iME]
+                    if self.AnalyticSens:
+                        dX = np.array(self._SectionInputs(MEInp))-XArr
+                        MEListFD = MEArr+np.sum(dX*SectionGrads, axis=1)
+                    else:
+                        MEListFD = [iMEOrg if ix==ixOrg else self._ComputeME(ix) for (iMEOrg, ix, ixOrg) \
+                            in zip(MEList, self._SectionInputs(MEInp), xList)]
+                    MEFD = self._TrapezoidalME(MEListFD, MEInp['PathLength'])
+                    MEsens += ((MEFD-MEorg)/self.FDTol)*x[DictKey+'SENS'][iME]
 
             # Store results in object
             # --------------------------------------------------------------- #
@@ -658,13 +906,18 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         else:
             # Compute FIS sensitivities
             # --------------------------------------------------------------- #
-            r0 = self(x)
+            r0 = self._ComputeME(x)
             Reason = self.Reasoning()
+            if self.AnalyticSens:
+                return [r0,self._ComputeMEGrad(x),Reason]
             rSens = []
-            for i in range(np.size(x)):
-                X = cp.deepcopy(x)
-                X[i]+= self.FDTol
-                rSens.append((self(X)-r0)/self.FDTol)
+            X = list(x)
+            for i in range(len(X)):
+                # Perturb in place and restore
+                XOrg = X[i]
+                X[i] = XOrg+self.FDTol
+                rSens.append((self._ComputeME(X)-r0)/self.FDTol)
+                X[i] = XOrg
             return [r0,np.array(rSens),Reason]
 
     def Reasoning(self):
@@ -690,18 +943,16 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         Gives hints on how to finally elaborate design such that lowest manufacturing effort level
         German: Ausgestaltungshinweise, sodass Herstellungsaufwaende minimal -> Konstruktionslehre: 'Ausarbeiten'
         '''
-        # Load elaboration hints
-        ElaborationHints = self._ElaborationHints
         # Evaluate elaboration hint based on critical rule
         [CritRule, VerbalVariable] = self._ElaborationList[:2]
-        for iHint in ElaborationHints.keys():
-            if CritRule in ElaborationHints[iHint]['Rule']:
-                if VerbalVariable in ElaborationHints[iHint]['VerbalVariable']:
-                    return iHint
+        Hint = self._HintIndex.get((CritRule, VerbalVariable))
+        if Hint is not None:
+            return Hint
         return 'Eorror in hint computation for RULE: "%s" and VERBAL VARIABLE: "%s"'%(CritRule, VerbalVariable)
 
     def ComputeYarnWidth(self,U,Phi):
-        return math.cos(Phi*math.pi/180.0)*2.0*(U)/self.nBobins
+        # U and Phi may be scalars or arrays
+        return np.cos(Phi*self.DEG2RAD)*2.0*U/self.nBobins
 
     def PlotAllResponseSurfaces(self,x,PlotSamplePerAx=100, UseTex=True, Extremal=True, \
             Language='Eng'): # 'Eng' 'Ger'
@@ -709,8 +960,9 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
             from mpl_toolkits.mplot3d import Axes3D
             import matplotlib.pyplot as plt
             from matplotlib import cm
-        except:
+        except ImportError:
             logging.error('Matplotlib could not be imported!')
+            raise
         plt.rc('text', usetex=UseTex)
         #plt.rc('font', family='serif')
         fig = plt.figure(figsize=plt.figaspect(0.5))
@@ -728,25 +980,11 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         Y = np.linspace(self.SubFIS1.Input['YarnWidth']['Range'][0], \
             self.SubFIS1.Input['YarnWidth']['Range'][1],num=PlotSamplePerAx)
         X, Y = np.meshgrid(X, Y)
-        Z = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
         if Extremal:
-            ZMin = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-            ZMax = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-        for ix in range(PlotSamplePerAx):
-            for jy in range(PlotSamplePerAx):
-                xTmp = cp.deepcopy(x)
-                xTmp[0] = X[ix,jy]
-                xTmp[1] = Y[ix,jy]
-                Z[ix,jy] = self(xTmp)
-                if Extremal:
-                    TMPInput = cp.deepcopy(self.FISxMinInputList )
-                    TMPInput[0] = X[ix,jy]
-                    TMPInput[1] = Y[ix,jy]
-                    ZMin[ix,jy] = self(TMPInput)
-                    TMPInput = cp.deepcopy(self.FISxMaxInputList)
-                    TMPInput[0] = X[ix,jy]
-                    TMPInput[1] = Y[ix,jy]
-                    ZMax[ix,jy] = self(TMPInput)
+            (Z, ZMin, ZMax) = self._ResponseSurfaces([x, self.FISxMinInputList, \
+                self.FISxMaxInputList], (0, 1), X, Y)
+        else:
+            Z = self._ResponseSurfaces([x], (0, 1), X, Y)[0]
         if Extremal:
             if Language=='Eng':
                 SurfacePlotter(fig,ax,X,Y,ZMin,[],r'Braiding angles [DEG]',r'Yarn width [mm]', AlphaVal=1.)
@@ -772,25 +1010,11 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         Y = np.linspace(self.SubFIS1.Input['BraidAngle']['Range'][0], \
             self.SubFIS1.Input['BraidAngle']['Range'][1],num=PlotSamplePerAx)
         X, Y = np.meshgrid(X, Y)
-        Z = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
         if Extremal:
-            ZMin = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-            ZMax = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-        for ix in range(PlotSamplePerAx):
-            for jy in range(PlotSamplePerAx):
-                xTmp = cp.deepcopy(x)
-                xTmp[2] = X[ix,jy]
-                xTmp[0] = Y[ix,jy]
-                Z[ix,jy] = self(xTmp)
-                if Extremal:
-                    TMPInput = cp.deepcopy(self.FISxMinInputList )
-                    TMPInput[2] = X[ix,jy]
-                    TMPInput[0] = Y[ix,jy]
-                    ZMin[ix,jy] = self(TMPInput)
-                    TMPInput = cp.deepcopy(self.FISxMaxInputList)
-                    TMPInput[2] = X[ix,jy]
-                    TMPInput[0] = Y[ix,jy]
-                    ZMax[ix,jy] = self(TMPInput)
+            (Z, ZMin, ZMax) = self._ResponseSurfaces([x, self.FISxMinInputList, \
+                self.FISxMaxInputList], (2, 0), X, Y)
+        else:
+            Z = self._ResponseSurfaces([x], (2, 0), X, Y)[0]
         if Extremal:
             if Language=='Eng':
                 SurfacePlotter(fig,ax,X,Y,ZMin,[],r'Ratio of radius to diameter [-]',r'Braiding angles [DEG]', AlphaVal=1.)
@@ -818,25 +1042,11 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         X = np.linspace(3.0,5.0,num=PlotSamplePerAx)
         Y = np.linspace(2.5,4.0,num=PlotSamplePerAx)
         X, Y = np.meshgrid(X, Y)
-        Z = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
         if Extremal:
-            ZMin = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-            ZMax = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-        for ix in range(PlotSamplePerAx):
-            for jy in range(PlotSamplePerAx):
-                xTmp = cp.deepcopy(x)
-                xTmp[3] = X[ix,jy]
-                xTmp[4] = Y[ix,jy]
-                Z[ix,jy] = self(xTmp)
-                if Extremal:
-                    TMPInput = cp.deepcopy(self.FISxMinInputList )
-                    TMPInput[3] = X[ix,jy]
-                    TMPInput[4] = Y[ix,jy]
-                    ZMin[ix,jy] = self(TMPInput)
-                    TMPInput = cp.deepcopy(self.FISxMaxInputList)
-                    TMPInput[3] = X[ix,jy]
-                    TMPInput[4] = Y[ix,jy]
-                    ZMax[ix,jy] = self(TMPInput)
+            (Z, ZMin, ZMax) = self._ResponseSurfaces([x, self.FISxMinInputList, \
+                self.FISxMaxInputList], (3, 4), X, Y)
+        else:
+            Z = self._ResponseSurfaces([x], (3, 4), X, Y)[0]
         if Extremal:
             if Language=='Eng':
                 SurfacePlotter(fig,ax,X,Y,ZMin,[],r'Edge radius [mm]',r'Aspect ratio [-]', AlphaVal=1.)
@@ -864,25 +1074,11 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
         X = np.linspace(8.,20.,num=PlotSamplePerAx)
         Y = np.linspace(2.,12,num=PlotSamplePerAx)
         X, Y = np.meshgrid(X, Y)
-        Z = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
         if Extremal:
-            ZMin = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-            ZMax = np.zeros([int(PlotSamplePerAx),int(PlotSamplePerAx)])
-        for ix in range(PlotSamplePerAx):
-            for jy in range(PlotSamplePerAx):
-                xTmp = cp.deepcopy(x)
-                xTmp[5] = X[ix,jy]
-                xTmp[6] = Y[ix,jy]
-                Z[ix,jy] = self(xTmp)
-                if Extremal:
-                    TMPInput = cp.deepcopy(self.FISxMinInputList )
-                    TMPInput[5] = X[ix,jy]
-                    TMPInput[6] = Y[ix,jy]
-                    ZMin[ix,jy] = self(TMPInput)
-                    TMPInput = cp.deepcopy(self.FISxMaxInputList)
-                    TMPInput[5] = X[ix,jy]
-                    TMPInput[6] = Y[ix,jy]
-                    ZMax[ix,jy] = self(TMPInput)
+            (Z, ZMin, ZMax) = self._ResponseSurfaces([x, self.FISxMinInputList, \
+                self.FISxMaxInputList], (5, 6), X, Y)
+        else:
+            Z = self._ResponseSurfaces([x], (5, 6), X, Y)[0]
         if Extremal:
             if Language=='Eng':
                 SurfacePlotter(fig,ax,X,Y,ZMin,[],r'Number of plies [-]',r'Number of patches [-]', AlphaVal=1.)
@@ -934,26 +1130,25 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
                 ErrorMSG = '"PathLength" not defined in MEInp, but needed!'
                 print(ErrorMSG)
                 sys.exit(ErrorMSG)
-                return [], [], ErrorMSG
 
             if 'PlyNum' not in MEInp.keys():
                 MEInp['PlyNum'] = [1.]*len(MEInp['PathLength'])
                 InfoStr += 'WARNING BraidME: No ply number given with MEInp["PlyNum"]\n'
                 InfoStr += '  -> Set to MEInp["PlyNum"] = [1.]*Sections\n'
 
-            LoopSet = zip(MEInp['BraidingAngle'][:-1], MEInp['BraidingAngle'][1:], \
-                MEInp['ProfileCircumferences'][:-1], MEInp['ProfileCircumferences'][1:], \
-                MEInp['PlyNum'], MEInp['PathLength'])
+            Phi = np.asarray(MEInp['BraidingAngle'], dtype=np.float64)
+            U = np.asarray(MEInp['ProfileCircumferences'], dtype=np.float64)
+            nLayer = np.asarray(MEInp['PlyNum'], dtype=np.float64)
+            Length = np.asarray(MEInp['PathLength'], dtype=np.float64)
+            nSections = min(len(Phi)-1, len(U)-1, len(nLayer), len(Length))
+            PhiMid = 0.5*(Phi[:nSections]+Phi[1:nSections+1])
+            UMid = 0.5*(U[:nSections]+U[1:nSections+1])
             self.UpdateHornGearParams()
-            nHornGears = self.nHornGears
-            HornGearSpeed = self.HornGearSpeed
-            # Compute times
-            tPhi = 0.
-            for (Phi1, Phi2, U1, U2, nLayer, iLength) in LoopSet:
-                PhiMid = 0.5*(Phi1+Phi2)
-                UMid = 0.5*(U1+U2)
-                tPhi += nLayer*math.tan(PhiMid*math.pi/180.)*nHornGears*iLength/(UMid*HornGearSpeed)
-            tDT = max(MEInp['PlyNum'])*tTurn
+            # Compute times, the horn gear factor is the same for all sections
+            HornGearFactor = self.nHornGears/self.HornGearSpeed
+            tPhi = HornGearFactor*float(np.dot(nLayer[:nSections]*Length[:nSections], \
+                np.tan(PhiMid*self.DEG2RAD)/UMid))
+            tDT = nLayer.max()*tTurn
             tManPower = 0
             # Assembly costs
             Costs = (tPhi+tDT)*aPhi+tManPower*aManPower
@@ -967,7 +1162,6 @@ class BraidME(FIS,Gauss2mf,Gaussmf,Trimf,Pimf,Const):        # Base class for al
             ErrorMSG += '    -> See class description for MEInp definition'
             print(ErrorMSG)
             sys.exit(ErrorMSG)
-            return [], [], ErrorMSG
 
 if __name__ == '__main__':
     x = [25.0, 2.7, 10, 5.0, 2.0, 5.0, 0.0]
@@ -980,6 +1174,11 @@ if __name__ == '__main__':
     # PlyNum     [-]   ... [5 20]   -> 5
     # PatchNum   [-]   ... [0 MaxPatches] -> 0
 
+    def LoadMEInp(FileName):
+        # Text pickles of python 2 with windows line endings
+        with open(os.path.join('01-BraidME-Data', FileName), 'rb') as MEInpFile:
+            return pickle.loads(MEInpFile.read().replace(b'\r\n', b'\n'), encoding='latin1')
+
     BraidMEM = BraidME()
     if os.path.isfile('BraidFIS.p'):
         # Loads existing FIS
@@ -1016,24 +1215,24 @@ if __name__ == '__main__':
         BraidMEM.PlotBraidFISOverRules(NumSupportPoints=200, ShowFig=True, FigFile=None, nRulesPerPlot=7.)
 
     elif TestCase == 'MEInpDict':
-        MEInp = pickle.load(open(os.path.join('01-BraidME-Data','MEInp.p'),'r') )
-        #print BraidMEM.ComputeResponse(MEInp)
+        MEInp = LoadMEInp('MEInp.p')
+        #print(BraidMEM.ComputeResponse(MEInp))
         ME = BraidMEM.ComputeResponse(MEInp)
         print('ME has been computed to be:')
         print(ME)
         BraidMEM.PrintMEInfoList()
 
     elif TestCase == 'MEInpDictSens':
-        MEInp = pickle.load(open(os.path.join('01-BraidME-Data','MEInp.p'),'r') )
-        #print BraidMEM.ComputeResponse(MEInp)
+        MEInp = LoadMEInp('MEInp.p')
+        #print(BraidMEM.ComputeResponse(MEInp))
         [ME, MEsens, MEReasonList] = BraidMEM.ComputeRespAndSens(MEInp)
         print('ME has been computed to be:')
         print(ME)
         BraidMEM.PrintMEInfoList()
 
     elif TestCase == 'Costs':
-        MEInp = pickle.load(open(os.path.join('01-BraidME-Data','MEInp.p'),'rb') )
-        #print BraidMEM.ComputeResponse(MEInp)
+        MEInp = LoadMEInp('MEInp.p')
+        #print(BraidMEM.ComputeResponse(MEInp))
         [Costs, tPhi, InfoStr] = BraidMEM.ComputeCost(MEInp)
         print('Braiding costs are [EUR]:')
         print(Costs)
@@ -31,9 +31,48 @@
 # Imports
 #------------------------------------------------------------------#
 import numpy as np
-import copy as cp
 import math
+import logging
+import os
 import sys
+import concurrent.futures
+import enum
+import functools
+try:
+    from numba import njit, prange
+except ImportError:
+    (njit, prange) = (None, range)
+
+# Numerical kernels are compiled by numba if available (machine code is
+# cached on disk), otherwise they run as plain python
+#------------------------------------------------------------------#
+def _JIT(Func):
+    if njit is None:
+        return Func
+    return njit(cache=True, fastmath=True)(Func)
+def _JITParallel(Func):
+    if njit is None:
+        return Func
+    return njit(cache=True, fastmath=True, parallel=True)(Func)
+SqrtMaxFloat = math.sqrt(sys.float_info.max)
+# Composite trapezoidal rule (renamed in numpy 2.0)
+_Trapezoid = getattr(np, 'trapezoid', None) or np.trapz
+@functools.lru_cache(maxsize=64)
+def SampleGrid(xL,xU,Num):
+    '''
+    Equidistant integration grid, cached and read-only since the same ranges
+    are sampled over and over
+    '''
+    xSample = np.linspace(xL,xU,num=int(Num))
+    xSample.setflags(write=False)
+    return xSample
+
+# Codes of the rule connectives in the compiled rule array
+#------------------------------------------------------------------#
+class Connective(enum.IntEnum):
+    UNKNOWN = -1
+    AND = 0
+    OR = 1
 
 # Definition of orthogonal projection
 #------------------------------------------------------------------#
@@ -51,8 +90,9 @@ def SurfacePlotter(fig,ax,X,Y,Z,SubTitel,xLabel,yLabel, AlphaVal=1.):
     try:
         from matplotlib import cm
         from mpl_toolkits.mplot3d import proj3d
-    except:
+    except ImportError:
         logging.error('Matplotlib could not be imported!')
+        raise
     surf = ax.plot_surface(X, Y, Z, alpha = AlphaVal, rstride=1, cstride=1, cmap=cm.coolwarm,
             linewidth=0, antialiased=False)
     proj3d.persp_transformation = orthogonal_proj
@@ -67,154 +107,486 @@ def SurfacePlotter(fig,ax,X,Y,Z,SubTitel,xLabel,yLabel, AlphaVal=1.):
         ax.set_xlabel(xLabel, fontsize=22)
     if yLabel:
         ax.set_ylabel(yLabel, fontsize=22)
+@_JIT
 def smfFCT(x,Para,Parb):
     if Para >= Parb:
-        smf = int(x >= (Para+Parb)/2.0)
-    else:
-        smf = 0.0
-        if (x <= Para):
-            smf = 0.0
-        if ((Para < x) & (x <= (Para+Parb)/2.0)):
-            smf = 2.0*((x-Para)/(Parb-Para))**2
-        if (((Para+Parb)/2.0 < x) & (x <= Parb)):
-            smf = 1.0-2.0*((x-Parb)/(Parb-Para))**2
-        if (Parb <= x):
-            smf = 1.0
-    return smf
+        if x >= (Para+Parb)/2.0:
+            return 1.0
+        return 0.0
+    # Normalized position clipped to [0, 1], the branches only select a formula
+    t = min(max((x-Para)/(Parb-Para), 0.0), 1.0)
+    return 2.0*t*t if t <= 0.5 else 1.0-2.0*(1.0-t)**2
+@_JIT
 def zmfFCT(x,Parc,Pard):
     if Parc >= Pard:
-        zmf = int(x <= (Pard+Parc)/2.0)
-    else:
-        zmf = 0.0
-        if x <= Parc:
-            zmf = 1.0
-        if ((Parc < x) & (x <= (Parc+Pard)/2)):
-            zmf = 1.0-2.0*((x-Parc)/(Parc-Pard))**2
-        if (((Parc+Pard)/2.0 < x) & (x <= Pard)):
-            zmf = 2.0*((Pard-x)/(Parc-Pard))**2
-        if (Pard <= x):
-            zmf = 0.0
-    return zmf
+        if x <= (Pard+Parc)/2.0:
+            return 1.0
+        return 0.0
+    t = min(max((x-Parc)/(Pard-Parc), 0.0), 1.0)
+    return 1.0-2.0*t*t if t <= 0.5 else 2.0*(1.0-t)**2
+@_JIT
+def gaussExpFCT(x,c,Inv2Sig2):
+    # Gaussian with the prenormalized constant Inv2Sig2 = 1/(2*Sig**2)
+    d = x-c
+    if abs(d) > SqrtMaxFloat:       # d*d would overflow
+        return 0.0
+    return math.exp(-d*d*Inv2Sig2)
+@_JIT
+def gaussFCT(x,Sig,c):
+    return gaussExpFCT(x,c,0.5/(Sig*Sig))
+@_JIT
+def gauss2ExpFCT(x,c1,Inv2Sig1,c2,Inv2Sig2):
+    y = 1.0
+    if x <= c1:
+        y *= gaussExpFCT(x,c1,Inv2Sig1)
+    if x >= c2:
+        y *= gaussExpFCT(x,c2,Inv2Sig2)
+    return y
+@_JIT
+def gauss2FCT(x,Sig1,c1,Sig2,c2):
+    return gauss2ExpFCT(x,c1,0.5/(Sig1*Sig1),c2,0.5/(Sig2*Sig2))
+@_JIT
+def trimfFCT(x,Para,Parb,Parc):
+    # Rising and falling edge, vertical edges (Para==Parb or Parb==Parc) are steps
+    Rise = (x-Para)/(Parb-Para) if Parb > Para else (1.0 if x > Para else 0.0)
+    Fall = (Parc-x)/(Parc-Parb) if Parc > Parb else (1.0 if x < Parc else 0.0)
+    return max(min(Rise, Fall, 1.0), 0.0)
+@_JIT
+def pimfFCT(x,Para,Parb,Parc,Pard):
+    return smfFCT(x,Para,Parb)*zmfFCT(x,Parc,Pard)
+
+# Right-sided derivatives of the mf functions above (used for sensitivities)
+#------------------------------------------------------------------#
+@_JIT
+def smfDerivFCT(x,Para,Parb):
+    if (Para >= Parb) or (x < Para) or (x >= Parb):
+        return 0.0
+    if x < (Para+Parb)/2.0:
+        return 4.0*(x-Para)/(Parb-Para)**2
+    return -4.0*(x-Parb)/(Parb-Para)**2
+@_JIT
+def zmfDerivFCT(x,Parc,Pard):
+    if (Parc >= Pard) or (x < Parc) or (x >= Pard):
+        return 0.0
+    if x < (Parc+Pard)/2.0:
+        return -4.0*(x-Parc)/(Parc-Pard)**2
+    return -4.0*(Pard-x)/(Parc-Pard)**2
+@_JIT
+def gauss2DerivFCT(x,Sig1,c1,Sig2,c2):
+    dLog = 0.0
+    if x <= c1:
+        dLog -= (x-c1)/Sig1**2
+    if x >= c2:
+        dLog -= (x-c2)/Sig2**2
+    return dLog*gauss2FCT(x,Sig1,c1,Sig2,c2)
+@_JIT
+def trimfDerivFCT(x,Para,Parb,Parc):
+    if x < Para or Parc <= x:
+        return 0.0
+    if x < Parb:
+        return 1.0/(Parb-Para)
+    return -1.0/(Parc-Parb)
+
+# Closed forms of the mf functions above for arrays, used instead of the
+# elementwise kernels if numba is not available
+#------------------------------------------------------------------#
+def smfArray(x,Para,Parb):
+    if Para >= Parb:
+        return np.where(x >= (Para+Parb)/2.0, 1.0, 0.0)
+    t = np.clip((x-Para)/(Parb-Para), 0.0, 1.0)
+    return np.where(t <= 0.5, 2.0*t*t, 1.0-2.0*(1.0-t)**2)
+def zmfArray(x,Parc,Pard):
+    if Parc >= Pard:
+        return np.where(x <= (Pard+Parc)/2.0, 1.0, 0.0)
+    t = np.clip((x-Parc)/(Pard-Parc), 0.0, 1.0)
+    return np.where(t <= 0.5, 1.0-2.0*t*t, 2.0*(1.0-t)**2)
+def gauss2Array(x,Sig1,c1,Sig2,c2):
+    (d1, d2) = (x-c1, x-c2)
+    with np.errstate(over='ignore'):
+        return np.exp(np.where(d1 <= 0.0, -(d1*d1)*(0.5/(Sig1*Sig1)), 0.0) \
+            + np.where(d2 >= 0.0, -(d2*d2)*(0.5/(Sig2*Sig2)), 0.0))
+def trimfArray(x,Para,Parb,Parc):
+    Rise = (x-Para)/(Parb-Para) if Parb > Para else np.where(x > Para, 1.0, 0.0)
+    Fall = (Parc-x)/(Parc-Parb) if Parc > Parb else np.where(x < Parc, 1.0, 0.0)
+    return np.clip(np.minimum(Rise, Fall), 0.0, 1.0)
+def EvalMFArray(x,Type,p):
+    '''
+    Evaluates one membership function given by its type code and parameters
+    at all values of the array x (see EvalMF)
+    '''
+    if Type == 0:       # Gaussmf
+        return gauss2Array(x,p[0],p[1],p[0],p[1])
+    elif Type == 1:     # Gauss2mf
+        return gauss2Array(x,p[0],p[1],p[2],p[3])
+    elif Type == 2:     # Trimf
+        return trimfArray(x,p[0],p[1],p[2])
+    elif Type == 3:     # Pimf
+        return smfArray(x,p[0],p[1])*zmfArray(x,p[2],p[3])
+    elif Type == 4:     # Smf
+        return smfArray(x,p[0],p[1])
+    elif Type == 5:     # Zmf
+        return zmfArray(x,p[0],p[1])
+    return np.full(np.shape(x), p[0])   # Const
+
+# Compiled fuzzification kernels
+#------------------------------------------------------------------#
+@_JIT
+def EvalMF(x,Type,p):
+    '''
+    Evaluates one membership function given by its type code and parameters
+    '''
+    if Type == 0:       # Gaussmf
+        return gaussFCT(x,p[0],p[1])
+    elif Type == 1:     # Gauss2mf
+        return gauss2FCT(x,p[0],p[1],p[2],p[3])
+    elif Type == 2:     # Trimf
+        return trimfFCT(x,p[0],p[1],p[2])
+    elif Type == 3:     # Pimf
+        return pimfFCT(x,p[0],p[1],p[2],p[3])
+    elif Type == 4:     # Smf
+        return smfFCT(x,p[0],p[1])
+    elif Type == 5:     # Zmf
+        return zmfFCT(x,p[0],p[1])
+    return p[0]         # Const
+@_JIT
+def EvalMFs(xIn,MFInp,Types,Params):
+    '''
+    Evaluates the membership functions of all inputs in a single pass
+    - xIn    ... value of each input
+    - MFInp  ... index of the input of each mf
+    - Types  ... type code of each mf (see MembershipFunction.TypeCode)
+    - Params ... parameters of each mf, padded to four columns
+    '''
+    Mu = np.empty(Types.shape[0])
+    for iMF in range(Types.shape[0]):
+        Mu[iMF] = EvalMF(xIn[MFInp[iMF]],Types[iMF],Params[iMF])
+    return Mu
+@_JIT
+def EvalMFsDeriv(xIn,MFInp,Types,Params):
+    '''
+    Derivatives of the membership functions w.r.t. their input (see EvalMFs)
+    '''
+    dMu = np.empty(Types.shape[0])
+    for iMF in range(Types.shape[0]):
+        x = xIn[MFInp[iMF]]
+        p = Params[iMF]
+        if Types[iMF] == 0:     # Gaussmf
+            dMu[iMF] = gauss2DerivFCT(x,p[0],p[1],p[0],p[1])
+        elif Types[iMF] == 1:   # Gauss2mf
+            dMu[iMF] = gauss2DerivFCT(x,p[0],p[1],p[2],p[3])
+        elif Types[iMF] == 2:   # Trimf
+            dMu[iMF] = trimfDerivFCT(x,p[0],p[1],p[2])
+        elif Types[iMF] == 3:   # Pimf
+            dMu[iMF] = smfDerivFCT(x,p[0],p[1])*zmfFCT(x,p[2],p[3]) \
+                + smfFCT(x,p[0],p[1])*zmfDerivFCT(x,p[2],p[3])
+        elif Types[iMF] == 4:   # Smf
+            dMu[iMF] = smfDerivFCT(x,p[0],p[1])
+        elif Types[iMF] == 5:   # Zmf
+            dMu[iMF] = zmfDerivFCT(x,p[0],p[1])
+        else:                   # Const
+            dMu[iMF] = 0.0
+    return dMu
+@_JITParallel
+def EvalMFsBatch(XIn,MFInp,Types,Params):
+    '''
+    Evaluates the membership functions at all points of XIn (points x inputs)
+    - returns array of shape (points x mfs)
+    '''
+    Mu = np.empty((XIn.shape[0], Types.shape[0]))
+    for ix in prange(XIn.shape[0]):
+        Mu[ix, :] = EvalMFs(XIn[ix],MFInp,Types,Params)
+    return Mu
+@_JITParallel
+def EvalMFVec(x,Type,p):
+    '''
+    Evaluates one membership function at all values of the 1d array x
+    '''
+    Mu = np.empty(x.shape[0])
+    for ix in prange(x.shape[0]):
+        Mu[ix] = EvalMF(x[ix],Type,p)
+    return Mu
+@_JIT
+def DefuzzifyPoint(ImpVals,dx,xMid,RuleOutMu,ImpMin,AggSum):
+    '''
+    Center of area defuzzification of one point
+    - ImpVals   ... implication of each rule
+    - RuleOutMu ... output mf of each rule sampled on the output grid
+    - ImpMin    ... min (True) or prod (False) implication
+    - AggSum    ... sum (True) or max (False) aggregation
+    '''
+    (nRules, nSamples) = RuleOutMu.shape
+    y = np.zeros(nSamples)
+    for iR in range(nRules):
+        Imp = ImpVals[iR]
+        if Imp<=0.0:
+            continue
+        for iS in range(nSamples):
+            if ImpMin:
+                yRule = min(RuleOutMu[iR, iS], Imp)
+            else:
+                yRule = RuleOutMu[iR, iS]*Imp
+            if AggSum:
+                y[iS] += yRule
+            else:
+                y[iS] = max(y[iS], yRule)
+    (Area, CoG) = (0.0, 0.0)
+    for iS in range(nSamples-1):
+        SliceArea = dx[iS]*(y[iS+1]+y[iS])*.5
+        Area += SliceArea
+        CoG += SliceArea*xMid[iS]
+    return CoG/Area
+@_JITParallel
+def DefuzzifyKernel(ImpVals,dx,xMid,RuleOutMu,ImpMin,AggSum):
+    '''
+    Center of area defuzzification of many points in parallel
+    - ImpVals ... implication of each rule (points x rules), see DefuzzifyPoint
+    '''
+    FISVals = np.empty(ImpVals.shape[0])
+    for iP in prange(ImpVals.shape[0]):
+        FISVals[iP] = DefuzzifyPoint(ImpVals[iP],dx,xMid,RuleOutMu,ImpMin,AggSum)
+    return FISVals
+@_JIT
+def ReduceKernel(Mu,Idx,Code):
+    '''
+    Reduces the mf values Mu[Idx] by min (0), prod (1), max (2) or sum (3)
+    '''
+    y = Mu[Idx[0]]
+    for i in range(1, Idx.shape[0]):
+        if Code == 0:
+            y = min(y, Mu[Idx[i]])
+        elif Code == 1:
+            y *= Mu[Idx[i]]
+        elif Code == 2:
+            y = max(y, Mu[Idx[i]])
+        else:
+            y += Mu[Idx[i]]
+    return y
+@_JIT
+def EvalFISKernel(xIn,MFInp,Types,Params,RuleIdx,RuleCodes,dx,xMid,RuleOutMu,ImpMin,AggSum):
+    '''
+    Fuzzification, rule evaluation and defuzzification of one input vector
+    - RuleCodes ... reduction of the antecedents of each rule (see ReduceKernel)
+    - returns the fuzzified mf vector, the implication of each rule and the FIS value
+    '''
+    Mu = EvalMFs(xIn,MFInp,Types,Params)
+    ImpVals = np.empty(RuleIdx.shape[0])
+    for iR in range(RuleIdx.shape[0]):
+        ImpVals[iR] = ReduceKernel(Mu,RuleIdx[iR],RuleCodes[iR])
+    return (Mu, ImpVals, DefuzzifyPoint(ImpVals,dx,xMid,RuleOutMu,ImpMin,AggSum))
+@_JIT
+def GradFISKernel(xIn,MFInp,Types,Params,RuleIdx,RuleCodes,dx,xMid,RuleOutMu,ImpMin,AggSum, \
+        Mu,ImpVals,FISValue,nInputs):
+    '''
+    Derivatives of the FIS value w.r.t. its inputs by a backward pass through
+    EvalFISKernel, Mu, ImpVals and FISValue are the results of the forward pass
+    - right-sided at kinks like FIS.GradFIS
+    '''
+    (nRules, nSamples) = RuleOutMu.shape
+    # Aggregated output, for max aggregation the first rule attaining the max
+    y = np.zeros(nSamples)
+    iMax = np.zeros(nSamples, dtype=np.intp)
+    for iR in range(nRules):
+        for iS in range(nSamples):
+            if ImpMin:
+                yRule = min(RuleOutMu[iR, iS], ImpVals[iR])
+            else:
+                yRule = RuleOutMu[iR, iS]*ImpVals[iR]
+            if AggSum:
+                y[iS] += yRule
+            elif yRule > y[iS]:
+                (y[iS], iMax[iS]) = (yRule, iR)
+    Area = 0.0
+    for iS in range(nSamples-1):
+        Area += dx[iS]*(y[iS+1]+y[iS])*.5
+    # d FISValue / d implication of each rule, then through the connectives
+    dMu = np.zeros(Mu.shape[0])
+    dyRule = np.empty(nSamples)
+    for iR in range(nRules):
+        for iS in range(nSamples):
+            if ImpMin:
+                dyRule[iS] = 1.0 if RuleOutMu[iR, iS] > ImpVals[iR] else 0.0
+            else:
+                dyRule[iS] = RuleOutMu[iR, iS]
+            if (not AggSum) and (iMax[iS] != iR):
+                dyRule[iS] = 0.0
+        dImp = 0.0
+        for iS in range(nSamples-1):
+            dImp += dx[iS]*(dyRule[iS+1]+dyRule[iS])*.5*(xMid[iS]-FISValue)
+        dImp /= Area
+        Idx = RuleIdx[iR]
+        Code = RuleCodes[iR]
+        if (Code == 0) or (Code == 2):
+            # Only the selected antecedent (first min or max) contributes
+            iSel = 0
+            for i in range(1, Idx.shape[0]):
+                if (Code == 0 and Mu[Idx[i]] < Mu[Idx[iSel]]) or (Code == 2 and Mu[Idx[i]] > Mu[Idx[iSel]]):
+                    iSel = i
+            dMu[Idx[iSel]] += dImp
+        else:
+            for i in range(Idx.shape[0]):
+                dAnt = dImp
+                if Code == 1:
+                    # Product of all other antecedents
+                    for j in range(Idx.shape[0]):
+                        if j != i:
+                            dAnt *= Mu[Idx[j]]
+                dMu[Idx[i]] += dAnt
+    dMu *= EvalMFsDeriv(xIn,MFInp,Types,Params)
+    dIn = np.zeros(nInputs)
+    for iMF in range(Mu.shape[0]):
+        dIn[MFInp[iMF]] += dMu[iMF]
+    return dIn
 
 # Base class definition
 #------------------------------------------------------------------#
 class MembershipFunction(object): # Base class for all membership functions
-    NumInfiSlice = 1e3
+    __slots__ = ()          # Parameters are slots, mfs have no __dict__
+    NumInfiSlice = 1000
+    TypeCode = None         # Type code for EvalMFs, None if not supported
     def __init__(self):
         pass
-    def CompArea(self,xL,xU,Ful):
-        Area = 0.0
-        xSample = np.linspace(xL,xU,num=self.NumInfiSlice)
-        for ixSample in range(1,np.size(xSample)):
-            xP=xSample[ixSample-1]
-            xN=xSample[ixSample]
-            yP=self(xP)
-            if yP>Ful:
-                yP=Ful
-            yN=self(xN)
-            if yN>Ful:
-                yN=Ful
-            Area+=(xN-xP)*(yN+yP)*.5
-        return Area
-    def CompCoA(self,xL,xU,Ful):
-        Area = 0.0
-        CoG = 0.0
-        xSample = np.linspace(xL,xU,num=self.NumInfiSlice)
-        for ixSample in range(1,np.size(xSample)):
-            xP=xSample[ixSample-1]
-            xN=xSample[ixSample]
-            yP=self(xP)
-            if yP>Ful:
-                yP=Ful
-            yN=self(xN)
-            if yN>Ful:
-                yN=Ful
-            Area+=(xN-xP)*(yN+yP)*.5
-            CoG+=(xN-xP)*(yN+yP)*.5*((xN-xP)*.5+xP)
-        return CoG/Area
+    def __getstate__(self):
+        return dict((iSlot, getattr(self, iSlot)) for iSlot in self.__slots__)
+    def __setstate__(self,State):
+        # Also restores mfs pickled with a __dict__, derived constants are recomputed
+        for (iName, Value) in State.items():
+            setattr(self, iName, Value)
+        self._Prenormalize()
+    def _Prenormalize(self):
+        pass
+    def EvalVec(self,x):
+        '''
+        Evaluates the mf at all values of the array x at once
+        '''
+        x = np.asarray(x, dtype=np.float64)
+        if self.TypeCode is None:
+            return np.array([self(ix) for ix in x.ravel()], dtype=np.float64).reshape(x.shape)
+        if njit is None:
+            return EvalMFArray(x, self.TypeCode, self.Params())
+        return EvalMFVec(x.ravel(), self.TypeCode, np.array(self.Params(), dtype=np.float64)).reshape(x.shape)
+    def _ClippedSamples(self,xL,xU,Ful,xGrid=None):
+        # xGrid optionally replaces the equidistant grid on [xL, xU]
+        xSample = SampleGrid(xL,xU,self.NumInfiSlice) if xGrid is None else np.asarray(xGrid)
+        return (xSample, np.minimum(self.EvalVec(xSample), Ful))
+    def CompArea(self,xL,xU,Ful,xGrid=None):
+        (xSample, ySample) = self._ClippedSamples(xL,xU,Ful,xGrid)
+        return _Trapezoid(ySample, xSample)
+    def CompCoA(self,xL,xU,Ful,xGrid=None):
+        (xSample, ySample) = self._ClippedSamples(xL,xU,Ful,xGrid)
+        dx = np.diff(xSample)
+        dArea = dx*(ySample[1:]+ySample[:-1])*.5
+        return np.sum(dArea*(dx*.5+xSample[:-1]))/np.sum(dArea)
 
 class Gauss2mf(MembershipFunction):
+    __slots__ = ('Sig1', 'c1', 'Sig2', 'c2', '_Inv2Sig1', '_Inv2Sig2')
+    TypeCode = 1
     def __init__(self,Sig1, c1, Sig2, c2):
         self.Sig1 = Sig1+0.0
         self.c1   = c1+0.0
         self.Sig2 = Sig2+0.0
         self.c2   = c2+0.0
+        self._Prenormalize()
+    def _Prenormalize(self):
+        self._Inv2Sig1 = 0.5/(self.Sig1*self.Sig1)
+        self._Inv2Sig2 = 0.5/(self.Sig2*self.Sig2)
     def __call__(self,x):
-        c1i = (x<=self.c1)
-        c2i = (x>=self.c2)
-        y1 = math.exp(-(x-self.c1)**2/(2.0*self.Sig1**2))*c1i+(1-c1i)
-        y2 = math.exp(-(x-self.c2)**2/(2.0*self.Sig2**2))*c2i+(1-c2i)
-        return y1*y2
+        return gauss2ExpFCT(x,self.c1,self._Inv2Sig1,self.c2,self._Inv2Sig2)
+    def Params(self):
+        return [self.Sig1, self.c1, self.Sig2, self.c2]
     def __str__(self):
         return 'Combined gaussian mf'
 
 class Gaussmf(MembershipFunction):
+    __slots__ = ('Sig', 'c', '_Inv2Sig2')
+    TypeCode = 0
     def __init__(self,Sig, c):
         self.Sig = Sig+0.0
         self.c   = c+0.0
+        self._Prenormalize()
+    def _Prenormalize(self):
+        self._Inv2Sig2 = 0.5/(self.Sig*self.Sig)
     def __call__(self,x):
-        return math.exp(-(x-self.c)**2/(2.0*self.Sig**2))
+        return gaussExpFCT(x,self.c,self._Inv2Sig2)
+    def Params(self):
+        return [self.Sig, self.c, 0.0, 0.0]
     def __str__(self):
         return 'Gaussian mf'
 
 class Const(MembershipFunction):
+    __slots__ = ('c',)
+    TypeCode = 6
     def __init__(self, c):
         self.c   = c+0.0
     def __call__(self,x):
         return self.c
+    def Params(self):
+        return [self.c, 0.0, 0.0, 0.0]
     def __str__(self):
         return 'Constant mf'
 
 class Smf(MembershipFunction):
+    __slots__ = ('a', 'b')
+    TypeCode = 4
     def __init__(self,a,b):
         self.a   = a+0.0
         self.b   = b+0.0
     def __call__(self,x):
         return smfFCT(x,self.a,self.b)
+    def Params(self):
+        return [self.a, self.b, 0.0, 0.0]
     def __str__(self):
         return 'S-shaped mf'
 
 class Trimf(MembershipFunction):
+    __slots__ = ('a', 'b', 'c')
+    TypeCode = 2
     def __init__(self,a,b,c):
         self.a   = a+0.0
         self.b   = b+0.0
         self.c   = c+0.0
     def __call__(self,x):
-        if (x<=self.a or self.c<=x):
-            return 0.0
-        if self.a!=self.b:
-            if self.a<x and x<self.b:
-                return (x-self.a)/(self.b-self.a)
-        if self.b!=self.c:
-            if self.b<x and x<self.c:
-                return (self.c-x)/(self.c-self.b)
-        if x==self.b:
-            return 1.0
+        return trimfFCT(x,self.a,self.b,self.c)
+    def Params(self):
+        return [self.a, self.b, self.c, 0.0]
     def __str__(self):
         return 'S-shaped mf'
 
 class Zmf(MembershipFunction):
+    __slots__ = ('c', 'd')
+    TypeCode = 5
     def __init__(self,c,d):
         self.c   = c+0.0
         self.d   = d+0.0
     def __call__(self,x):
         return zmfFCT(x,self.c,self.d)
+    def Params(self):
+        return [self.c, self.d, 0.0, 0.0]
     def __str__(self):
         return 'Z-shaped mf'
 
 class Pimf(MembershipFunction):
+    __slots__ = ('a', 'b', 'c', 'd')
+    TypeCode = 3
     def __init__(self,a,b,c,d):
         self.a   = a+0.0
         self.b   = b+0.0
         self.c   = c+0.0
         self.d   = d+0.0
     def __call__(self,x):
-        return smfFCT(x,self.a,self.b)*zmfFCT(x,self.c,self.d)
+        return pimfFCT(x,self.a,self.b,self.c,self.d)
+    def Params(self):
+        return [self.a, self.b, self.c, self.d]
     def __str__(self):
         return 'Pi-shaped mf'
 
 class FuzzyTools(object):        # Base class for all fuzzy tools
-    NumInfiSlice = 1e3
+    NumInfiSlice = 1000
+    MaxBatchElements = 2**22    # Max. size of temporary arrays in batch evaluations
+    _Compiled = False       # Set by Compile
+    _InputFuzzyVals = None  # Built on demand by InputFuzzyVals
+    _InpPerRuleVals = None  # Built on demand by InpPerRuleVals
+    _AntVals = None         # Antecedent values of the last FireRules
+    _xIn = None             # Input values of the last Fuzzify
     def __init__(self,Name,Type,InfoUpperStr):
         self.Name = Name
         self.Type = Type
@@ -249,18 +621,19 @@ class FuzzyTools(object):        # Base class for all fuzzy tools
         self.nOutRules = len(self.Output.keys())
     def ResetRules(self):
         self.nRules = len(self.Rules.keys())
+    # Reductions of lists by the C implemented builtins, arrays by numpy
     def Prod(self,List):
-        Prod = 1
-        for i in List:
-            Prod *= i
-        return Prod
+        if isinstance(List, np.ndarray):
+            return List.prod()
+        return math.prod(List)
     def Sum(self,List):
-        Sum = 0
-        for i in List:
-            Sum += i
-        return Sum
+        if isinstance(List, np.ndarray):
+            return List.sum()
+        return sum(List)
     def AND(self,InputVals):
         if self.AndMethod == 'min':
+            if isinstance(InputVals, np.ndarray):
+                return InputVals.min()
             return min(InputVals)
         elif self.AndMethod == 'prod':
             return self.Prod(InputVals)
@@ -270,6 +643,8 @@ class FuzzyTools(object):        # Base class for all fuzzy tools
             return []
     def OR(self,InputVals):
         if self.OrMethod == 'max':
+            if isinstance(InputVals, np.ndarray):
+                return InputVals.max()
             return max(InputVals)
         elif self.OrMethod == 'sum':
             return self.Sum(InputVals)
@@ -277,88 +652,326 @@ class FuzzyTools(object):        # Base class for all fuzzy tools
             if self.PrintInfo:
                 print('Desired OR-Rule not implemented yet!')
             return []
-    def Fuzzify(self,InputDict):
-        self.InputFuzzyVals = dict()
-        for iInput in self.Input.keys():
-            self.InputFuzzyVals[iInput] = dict()
+    def Compile(self):
+        '''
+        Compiles inputs and rules into arrays for the vectorized evaluation
+        - has to be called again whenever Input or Rules are changed
+        '''
+        self.ResetInput()
+        self.ResetRules()
+        self.CompileMFs()
+        self.CompileRules()
+        self.CompileOutput()
+        self.CompileKernel()
+        self._Compiled = True
+    def CompileMFs(self):
+        '''
+        Flattens the membership functions of all inputs into one vector, each mf
+        is addressed by its index in _MFIndex[(input, mf)]
+        - type codes and parameters (SoA) are evaluated at once by EvalMFs,
+          they are None if any mf is unknown to EvalMFs
+        '''
+        self._InputKeys = list(self.Input.keys())
+        (self._MFIndex, MFInp, self._MFObjects) = (dict(), list(), list())
+        for (iRow, iInput) in enumerate(self._InputKeys):
             for iMF in self.Input[iInput]['MF'].keys():
-                self.InputFuzzyVals[iInput][iMF] = self.Input[iInput]['MF'][iMF](InputDict[iInput])
+                self._MFIndex[(iInput, iMF)] = len(MFInp)
+                MFInp.append(iRow)
+                self._MFObjects.append(self.Input[iInput]['MF'][iMF])
+        self._MFInp = np.array(MFInp, dtype=np.intp)
+        self._MuVec = np.zeros(self._MFInp.size)
+        self._xIn = None
+        (self._MFTypes, self._MFParams) = (None, None)
+        if any(MF.TypeCode is None for MF in self._MFObjects):
+            return
+        self._MFTypes = np.array([MF.TypeCode for MF in self._MFObjects], dtype=np.int8)
+        self._MFParams = np.array([MF.Params() for MF in self._MFObjects], dtype=np.float64)
+        # Gaussian mfs are evaluated by FuzzifyBatch with one exp call,
+        # a gaussmf is stored as gauss2mf with equal sides
+        IsGauss = (self._MFTypes==Gaussmf.TypeCode) | (self._MFTypes==Gauss2mf.TypeCode)
+        GaussIdx = np.flatnonzero(IsGauss)
+        GaussPars = self._MFParams[GaussIdx, :]
+        IsGaussmf = self._MFTypes[GaussIdx]==Gaussmf.TypeCode
+        GaussPars[IsGaussmf, 2:] = GaussPars[IsGaussmf, :2]
+        self._GaussTables = (GaussIdx, self._MFInp[GaussIdx], GaussPars[:, 1], 0.5/GaussPars[:, 0]**2, \
+            GaussPars[:, 3], 0.5/GaussPars[:, 2]**2)
+        # Constant mfs are folded into the batch results once per batch
+        IsConst = self._MFTypes==Const.TypeCode
+        self._ConstTables = (np.flatnonzero(IsConst), self._MFParams[IsConst, 0])
+        OtherIdx = np.flatnonzero(~(IsGauss | IsConst))
+        self._OtherMFTables = (OtherIdx, self._MFInp[OtherIdx], self._MFTypes[OtherIdx], \
+            self._MFParams[OtherIdx, :])
+    def CompileRules(self):
+        '''
+        Packs the rules into a structured array (one record per rule) holding the
+        connective code (see Connective), the index of each antecedent
+        in the fuzzified mf vector and the index of the consequent output mf
+        - the rule tables for the evaluation are None if a rule or method is not supported
+        '''
+        self._OutMFIndex = dict()
+        for iOutput in self.Output.keys():
+            for iMF in self.Output[iOutput]['MF'].keys():
+                self._OutMFIndex[(iOutput, iMF)] = len(self._OutMFIndex)
+        RuleDtype = np.dtype([('Connective', np.int8), ('Antecedent', np.intp, (self.nInpRules,)), \
+            ('Consequent', np.intp)])
+        self._RuleKeys = list(self.Rules.keys())
+        self._RuleArray = np.zeros(self.nRules, dtype=RuleDtype)
+        for (iR, iRule) in enumerate(self.Rules.keys()):
+            CurRule = self.Rules[iRule]
+            self._RuleArray[iR] = (Connective.__members__.get(CurRule[0], Connective.UNKNOWN), \
+                [self._MFIndex[(CurRule[iInput*2+1], CurRule[iInput*2+2])] for iInput in range(self.nInpRules)], \
+                self._OutMFIndex[(CurRule[self.nInpRules*2+2], CurRule[self.nInpRules*2+3])])
+        self._RuleTables = None
+        Reducer = {'min': np.min, 'prod': np.prod, 'max': np.max, 'sum': np.sum}
+        if (self.AndMethod not in Reducer) or (self.OrMethod not in Reducer) or \
+                np.any(self._RuleArray['Connective']==Connective.UNKNOWN):
+            return
+        # Contiguous copies of the fields for the gathers in the hot path
+        self._RuleTables = (np.ascontiguousarray(self._RuleArray['Antecedent']), \
+            self._RuleArray['Connective']==Connective.AND, Reducer[self.AndMethod], Reducer[self.OrMethod])
+    def CompileOutput(self):
+        '''
+        Samples each output mf once on the fixed defuzzification grid and gathers
+        the samples of the consequent of each rule
+        - the tables of the compiled defuzzification are None if implication or
+          aggregation method is not supported, Defuzzify uses the samples anyway
+        '''
+        iKey = list(self.Output)[0]
+        xSample = SampleGrid(self.Output[iKey]['Range'][0],self.Output[iKey]['Range'][1],self.NumInfiSlice)
+        OutMu = np.zeros([len(self._OutMFIndex), xSample.size])
+        for ((iOutput, iMF), iIdx) in self._OutMFIndex.items():
+            OutMu[iIdx, :] = self.Output[iOutput]['MF'][iMF].EvalVec(xSample)
+        RuleOutMu = OutMu[self._RuleArray['Consequent'], :]
+        dx = xSample[1:]-xSample[:-1]
+        xMid = dx*.5+xSample[:-1]
+        self._OutSamples = (dx, xMid, RuleOutMu)
+        self._OutTables = None
+        if (self.ImpRule not in ['min', 'prod']) or (self.AggRule not in ['sum', 'max']):
+            return
+        self._OutTables = self._OutSamples
+        self._OutTables32 = tuple(iTable.astype(np.float32) for iTable in self._OutTables)
+    def CompileKernel(self):
+        '''
+        Collects the arguments of EvalFISKernel, which evaluates the whole FIS
+        for one input vector in a single compiled call
+        - None if mfs, rules or methods are not supported, the kernel is only
+          used with numba (checked on use, since compiled FIS are pickled)
+        '''
+        self._KernelArgs = None
+        if (self._MFTypes is None) or (self._RuleTables is None) or (self._OutTables is None):
+            return
+        ReducerCode = {'min': 0, 'prod': 1, 'max': 2, 'sum': 3}
+        RuleCodes = np.where(self._RuleTables[1], ReducerCode[self.AndMethod], \
+            ReducerCode[self.OrMethod]).astype(np.int8)
+        self._KernelArgs = (self._MFInp, self._MFTypes, self._MFParams, self._RuleTables[0], \
+            RuleCodes) + self._OutTables + (self.ImpRule=='min', self.AggRule=='sum')
+    def Fuzzify(self,InputDict):
+        if not self._Compiled:
+            self.Compile()
+        xIn = np.array([InputDict[iInput] for iInput in self._InputKeys], dtype=np.float64)
+        # Membership values of the inputs unchanged since the last call are
+        # reused, finite differences and sweeps only vary few inputs at a time
+        if self._xIn is None:
+            MFIdx = None
+        else:
+            MFIdx = np.flatnonzero((xIn!=self._xIn)[self._MFInp])
+            if MFIdx.size==self._MFInp.size:
+                MFIdx = None
+        self._xIn = xIn
+        self._InputFuzzyVals = None
+        if MFIdx is None:
+            if self._MFTypes is None:
+                self._MuVec = np.array([MF(xIn[iRow]) for (iRow, MF) in \
+                    zip(self._MFInp, self._MFObjects)], dtype=np.float64)
+            else:
+                self._MuVec = EvalMFs(xIn, self._MFInp, self._MFTypes, self._MFParams)
+            return
+        self._MuVec = self._MuVec.copy()
+        if self._MFTypes is None:
+            for iMF in MFIdx.tolist():
+                self._MuVec[iMF] = self._MFObjects[iMF](xIn[self._MFInp[iMF]])
+        elif MFIdx.size:
+            self._MuVec[MFIdx] = EvalMFs(xIn, self._MFInp[MFIdx], self._MFTypes[MFIdx], self._MFParams[MFIdx])
+    @property
+    def InputFuzzyVals(self):
+        '''
+        Membership values of the last fuzzified input (input -> mf -> value)
+        - built on first access after each Fuzzify
+        '''
+        if self._InputFuzzyVals is None:
+            MuList = self._MuVec.tolist()
+            self._InputFuzzyVals = dict((iInput, dict()) for iInput in self._InputKeys)
+            for ((iInput, iMF), iIdx) in self._MFIndex.items():
+                self._InputFuzzyVals[iInput][iMF] = MuList[iIdx]
+        return self._InputFuzzyVals
+    def _BatchInputArray(self,InputDict):
+        # Input values as array (points x inputs), InputDict is either a dict of
+        # arrays or already such an array with the inputs in the order of Input
+        if isinstance(InputDict, dict):
+            return np.column_stack([np.asarray(InputDict[iInput], dtype=np.float64).ravel() \
+                for iInput in self._InputKeys])
+        return np.asarray(InputDict, dtype=np.float64).reshape(-1, len(self._InputKeys))
+    def FuzzifyBatch(self,InputDict):
+        '''
+        Fuzzifies arrays of input values (InputDict holds one array per input or
+        is an array of shape (points x inputs))
+        - returns array of shape (points x mfs)
+        '''
+        if not self._Compiled:
+            self.Compile()
+        XIn = self._BatchInputArray(InputDict)
+        if self._MFTypes is None:
+            return np.array([[MF(ix[iRow]) for (iRow, MF) in zip(self._MFInp, self._MFObjects)] \
+                for ix in XIn], dtype=np.float64)
+        MuMatrix = np.empty((XIn.shape[0], self._MFInp.size))
+        (OtherIdx, OtherInp, OtherTypes, OtherParams) = self._OtherMFTables
+        if OtherIdx.size and (njit is None):
+            for (iMF, iInp, iType, iParams) in zip(OtherIdx, OtherInp, OtherTypes, OtherParams):
+                MuMatrix[:, iMF] = EvalMFArray(XIn[:, iInp], iType, iParams)
+        elif OtherIdx.size:
+            MuMatrix[:, OtherIdx] = EvalMFsBatch(XIn, OtherInp, OtherTypes, OtherParams)
+        MuMatrix[:, self._GaussTables[0]] = self._EvalGaussians(XIn)
+        MuMatrix[:, self._ConstTables[0]] = self._ConstTables[1]
+        return MuMatrix
+    def _EvalGaussians(self,XIn):
+        # All gaussian mfs at all points (points x inputs) with a single vectorized exp
+        (GaussIdx, GaussInp, c1, Inv2Sig1, c2, Inv2Sig2) = self._GaussTables
+        x = XIn[:, GaussInp]
+        (d1, d2) = (x-c1, x-c2)
+        with np.errstate(over='ignore'):
+            Exponent = np.where(d1 <= 0., -(d1*d1)*Inv2Sig1, 0.) \
+                + np.where(d2 >= 0., -(d2*d2)*Inv2Sig2, 0.)
+        return np.exp(Exponent)
+    def _ImplicationArray(self,MuArray):
+        # Antecedent values and implication of all rules, leading axes of MuArray are kept
+        (RuleIdx, IsAnd, AndReducer, OrReducer) = self._RuleTables
+        AntVals = MuArray[..., RuleIdx]
+        return AntVals, np.where(IsAnd, AndReducer(AntVals, axis=-1), OrReducer(AntVals, axis=-1))
+    def FireRules(self):
+        '''
+        Evaluates the implication of all rules at once on the fuzzified inputs
+        '''
+        (AntVals, ImpVals) = self._ImplicationArray(self._MuVec)
+        self.OutImpl = ImpVals.tolist()
+        self._AntVals = AntVals
+        self._InpPerRuleVals = None
+    @property
+    def InpPerRuleVals(self):
+        '''
+        Antecedent values per rule of the last rule evaluation (rule -> list)
+        - only needed for reasoning and plots, hence built on first access
+        '''
+        if self._InpPerRuleVals is None and self._AntVals is not None:
+            self._InpPerRuleVals = dict(zip(self._RuleKeys, self._AntVals.tolist()))
+        return self._InpPerRuleVals
+    @InpPerRuleVals.setter
+    def InpPerRuleVals(self,Value):
+        self._AntVals = None
+        self._InpPerRuleVals = Value
     def EvalImpl(self,CurRule):
         InpVals=[]
         for iInput in range(self.nInpRules):
             InpVals.append(self.InputFuzzyVals[CurRule[iInput*2+1]][CurRule[iInput*2+2]])
-        self.InpValsTMP = cp.deepcopy(InpVals)
-        if CurRule[0]=='AND':
+        self.InpValsTMP = InpVals     # Fresh list, never modified afterwards
+        return self._Implication(CurRule[0], InpVals)
+    def _Implication(self,RuleConnective,InpVals):
+        if RuleConnective=='AND':
             ImpVal = self.AND(InpVals)
-        elif CurRule[0]=='OR':
+        elif RuleConnective=='OR':
             ImpVal = self.OR(InpVals)
         else:
             if self.PrintInfo:
                 print('Desired rule not implemented yet!')
             return []
         return ImpVal
+    def _OutTablesOf(self,ImpVals):
+        # Output tables in the precision of ImpVals (float64 or float32)
+        return self._OutTables32 if ImpVals.dtype==np.float32 else self._OutTables
+    def _DefuzzifyArray(self,ImpVals,Rules=None,OutTables=None):
+        # Center of area on the precomputed output mf samples, ImpVals is (points x rules)
+        # and is evaluated in its own precision unless OutTables are given, Rules
+        # optionally selects the rules the columns of ImpVals belong to
+        (dx, xMid, RuleOutMu) = self._OutTablesOf(ImpVals) if OutTables is None else OutTables
+        if Rules is not None:
+            RuleOutMu = RuleOutMu[Rules]
+        ImpVals = ImpVals[:, :, np.newaxis]
+        if self.ImpRule=='min':
+            yRules = np.minimum(RuleOutMu, ImpVals)
+        else:
+            yRules = RuleOutMu*ImpVals
+        if self.AggRule=='sum':
+            y = yRules.sum(axis=1)
+        else:
+            y = yRules.max(axis=1)
+        Area = dx*(y[:, 1:]+y[:, :-1])*.5
+        return np.dot(Area, xMid)/np.sum(Area, axis=1)
+    def DefuzzifyCompiled(self,ImpVal):
+        '''
+        Center of area defuzzification on the precomputed output mf samples
+        - rules with zero implication add nothing to the aggregated output
+          and are skipped
+        '''
+        ImpVal = np.asarray(ImpVal, dtype=np.float64)
+        Active = np.flatnonzero(ImpVal>0.0)
+        if (Active.size==0) or (Active.size==ImpVal.size):
+            return float(self._DefuzzifyArray(ImpVal[np.newaxis, :])[0])
+        return float(self._DefuzzifyArray(ImpVal[np.newaxis, Active], Active)[0])
+    def DefuzzifyBatch(self,ImpVals):
+        '''
+        Center of area defuzzification for an array of implications (points x rules)
+        - with numba the points are processed in parallel by DefuzzifyKernel,
+          otherwise in chunks to limit the size of temporary arrays, which are
+          distributed over threads (numpy releases the GIL in its loops)
+        - float32 implications are defuzzified on the float32 output tables,
+          which are selected once for all chunks
+        '''
+        if ImpVals.shape[0]==0:
+            return np.empty(0)
+        OutTables = self._OutTablesOf(ImpVals)
+        if njit is not None:
+            return DefuzzifyKernel(np.ascontiguousarray(ImpVals), *OutTables, \
+                ImpMin=self.ImpRule=='min', AggSum=self.AggRule=='sum')
+        # Temporary arrays of all threads together are limited by MaxBatchElements
+        nPoints = max(1, int(self.MaxBatchElements//self._OutTables[2].size))
+        nWorkers = max(1, min(os.cpu_count() or 1, ImpVals.shape[0]//nPoints))
+        nChunk = max(1, nPoints//nWorkers)
+        Starts = range(0, ImpVals.shape[0], nChunk)
+        DefuzzifyChunk = lambda iStart: self._DefuzzifyArray(ImpVals[iStart:iStart+nChunk], OutTables=OutTables)
+        if nWorkers==1:
+            return np.concatenate([DefuzzifyChunk(iStart) for iStart in Starts])
+        with concurrent.futures.ThreadPoolExecutor(max_workers=nWorkers) as Executor:
+            return np.concatenate(list(Executor.map(DefuzzifyChunk, Starts)))
     def Defuzzify(self,ImpVal):
-        Area = 0.0
-        CoG = 0.0
-        #iKey = self.Output.keys()[0]
-        iKey = list(self.Output)[0]
-        xSample = np.linspace(self.Output[iKey]['Range'][0],self.Output[iKey]['Range'][1],num=self.NumInfiSlice)
-        for ixSample in range(1,np.size(xSample)):
-            xP=xSample[ixSample-1]
-            xN=xSample[ixSample]
-            if self.AggRule=='sum':
-                yP=0
-                yN=0
-                iR=0
-                for iRule in self.Rules.keys():
-                    yTMP=self.Output[self.Rules[iRule][self.nInpRules*2+2]]['MF'][self.Rules[iRule][self.nInpRules*2+3]](xP)
-                    if self.ImpRule=='min':
-                        if yTMP>ImpVal[iR]:
-                            yP+=ImpVal[iR]
-                        else:
-                            yP+=yTMP
-                    elif self.ImpRule=='prod':
-                        yP+=yTMP*ImpVal[iR]
-                    yTMP=self.Output[self.Rules[iRule][self.nInpRules*2+2]]['MF'][self.Rules[iRule][self.nInpRules*2+3]](xN)
-                    if self.ImpRule=='min':
-                        if yTMP>ImpVal[iR]:
-                            yN+=ImpVal[iR]
-                        else:
-                            yN+=yTMP
-                    elif self.ImpRule=='prod':
-                        yN+=yTMP*ImpVal[iR]
-                    iR+=1
-            elif self.AggRule=='max':
-                yPL=[]
-                yNL=[]
-                iR=0
-                for iRule in self.Rules.keys():
-                    yTMP=self.Output[self.Rules[iRule][self.nInpRules*2+2]]['MF'][self.Rules[iRule][self.nInpRules*2+3]](xP)
-                    if self.ImpRule=='min':
-                        if yTMP>ImpVal[iR]:
-                            yPL.append(ImpVal[iR])
-                        else:
-                            yPL.append(yTMP)
-                    elif self.ImpRule=='prod':
-                        yPL.append(yTMP*ImpVal[iR])
-                    yTMP=self.Output[self.Rules[iRule][self.nInpRules*2+2]]['MF'][self.Rules[iRule][self.nInpRules*2+3]](xN)
-                    if self.ImpRule=='min':
-                        if yTMP>ImpVal[iR]:
-                            yNL.append(ImpVal[iR])
-                        else:
-                            yNL.append(yTMP)
-                    elif self.ImpRule=='prod':
-                        yNL.append(yTMP*ImpVal[iR])
-                    iR+=1
-                yP=max(yPL)
-                yN=max(yNL)
-            else:
-                if self.PrintInfo:
-                    print('Desired Agg-Rule not implemented yet!')
-                return []
-            Area+=(xN-xP)*(yN+yP)*.5
-            CoG+=(xN-xP)*(yN+yP)*.5*((xN-xP)*.5+xP)
-        return CoG/Area
+        '''
+        Center of area defuzzification, all rules and samples at once
+        '''
+        if self.AggRule not in ['sum', 'max']:
+            if self.PrintInfo:
+                print('Desired Agg-Rule not implemented yet!')
+            return []
+        # Samples of the consequent mf of each rule (rules x samples) are
+        # computed once by Compile
+        if not self._Compiled:
+            self.Compile()
+        (dx, xMid, yRules) = self._OutSamples
+        ImpVal = np.asarray(ImpVal, dtype=np.float64)
+        # Rules with zero implication add nothing to the aggregated output
+        Active = np.flatnonzero(ImpVal>0.0)
+        if 0<Active.size<ImpVal.size:
+            (ImpVal, yRules) = (ImpVal[Active], yRules[Active])
+        ImpVal = ImpVal[:, np.newaxis]
+        if self.ImpRule=='min':
+            yRules = np.minimum(yRules, ImpVal)
+        elif self.ImpRule=='prod':
+            yRules = yRules*ImpVal
+        else:
+            yRules = np.zeros_like(yRules)
+        if self.AggRule=='sum':
+            y = yRules.sum(axis=0)
+        else:
+            y = yRules.max(axis=0)
+        Area = dx*(y[1:]+y[:-1])*.5
+        return float(np.dot(Area, xMid)/np.sum(Area))
 
 class FIS(FuzzyTools):
     Input = dict()
@@ -387,50 +1000,143 @@ class FIS(FuzzyTools):
         self.ResetRules()
         #if len(InputDict.keys())!=self.nInpRules:
         #    if self.PrintInfo:
-        #        print 'Length of X differs from number of existing input rules!'
+        #        print('Length of X differs from number of existing input rules!')
         #    return []
+        if not self._Compiled:
+            self.Compile()
+        if (self._KernelArgs is not None) and (njit is not None):
+            xIn = np.array([InputDict[iInput] for iInput in self._InputKeys], dtype=np.float64)
+            (self._MuVec, ImpVals, self.FISValue) = EvalFISKernel(xIn, *self._KernelArgs)
+            self._xIn = xIn
+            self._InputFuzzyVals = None
+            self.OutImpl = ImpVals.tolist()
+            self._AntVals = self._MuVec[self._RuleTables[0]]
+            self._InpPerRuleVals = None
+            return self.FISValue
         self.Fuzzify(InputDict)
-        self.OutImpl = []
-        self.InpPerRuleVals=dict()
-        for iRule in self.Rules.keys():
-            self.OutImpl.append(self.EvalImpl(self.Rules[iRule]))
-            self.InpPerRuleVals[iRule] = self.InpValsTMP
-        self.FISValue = cp.deepcopy(self.Defuzzify(self.OutImpl))
+        if self._RuleTables is not None:
+            self.FireRules()
+        else:
+            # Antecedent values are gathered by the compiled rule indices,
+            # only the connectives are evaluated rule by rule
+            self.OutImpl = []
+            self.InpPerRuleVals=dict()
+            AntVals = self._MuVec[self._RuleArray['Antecedent']].tolist()
+            for ((iRule, CurRule), InpVals) in zip(self.Rules.items(), AntVals):
+                self.OutImpl.append(self._Implication(CurRule[0], InpVals))
+                self.InpPerRuleVals[iRule] = InpVals
+        if self._OutTables is not None:
+            self.FISValue = self.DefuzzifyCompiled(self.OutImpl)
+        else:
+            self.FISValue = self.Defuzzify(self.OutImpl)
         return self.FISValue
+    def EvalFISBatch(self,InputDict,Dtype=np.float64):
+        '''
+        Evaluates the FIS for arrays of inputs (InputDict holds one array per input
+        or is an array of shape (points x inputs), see FuzzifyBatch)
+        - returns the array of FIS values, OutImpl etc. are not updated unless
+          rules or methods are not supported by the compiled tables, then the
+          points are evaluated one by one by EvalFIS (states refer to the last)
+        - Dtype=np.float32 halves the memory traffic of the defuzzification
+          (~1e-6 accuracy, sufficient for plots but not for finite differences)
+        '''
+        if not self._Compiled:
+            self.Compile()
+        if (self._RuleTables is None) or (self._OutTables is None):
+            return np.array([self.EvalFIS(dict(zip(self._InputKeys, iPoint))) for iPoint in \
+                self._BatchInputArray(InputDict).tolist()])
+        MuMatrix = self.FuzzifyBatch(InputDict)
+        (AntVals, ImpVals) = self._ImplicationArray(MuMatrix)
+        return self.DefuzzifyBatch(ImpVals.astype(Dtype, copy=False)).astype(np.float64)
+    @staticmethod
+    def _ReducerDeriv(Method,AntVals):
+        # Derivative of a rule connective w.r.t. each antecedent (rules x antecedents)
+        if Method=='sum':
+            return np.ones(AntVals.shape)
+        if Method=='prod':
+            # Product of all other antecedents
+            Ones = np.ones((AntVals.shape[0], 1))
+            Left = np.cumprod(np.hstack([Ones, AntVals[:, :-1]]), axis=1)
+            Right = np.cumprod(np.hstack([Ones, AntVals[:, :0:-1]]), axis=1)[:, ::-1]
+            return Left*Right
+        iSelected = np.argmin(AntVals, axis=1) if Method=='min' else np.argmax(AntVals, axis=1)
+        return (np.arange(AntVals.shape[1])==iSelected[:, np.newaxis]).astype(np.float64)
+    def GradFIS(self):
+        '''
+        Analytic derivatives of the last FIS value (EvalFIS) w.r.t. its inputs
+        - returns dict input -> derivative
+        - derivatives are right-sided at kinks of mfs, min and max
+        - needs the compiled tables (see Compile)
+        '''
+        if (self._MFTypes is None) or (self._RuleTables is None) or (self._OutTables is None):
+            raise ValueError('FIS '+self.Name+' is not supported by the analytic derivatives!')
+        if (self._KernelArgs is not None) and (njit is not None):
+            dIn = GradFISKernel(self._xIn, *self._KernelArgs, self._MuVec, np.asarray(self.OutImpl), \
+                self.FISValue, len(self._InputKeys))
+            return dict(zip(self._InputKeys, dIn.tolist()))
+        (RuleIdx, IsAnd, AndReducer, OrReducer) = self._RuleTables
+        (dx, xMid, RuleOutMu) = self._OutTables
+        ImpVals = np.asarray(self.OutImpl)[:, np.newaxis]
+        # d FISValue / d implication of each rule
+        if self.ImpRule=='min':
+            (yRules, dyRules) = (np.minimum(RuleOutMu, ImpVals), (RuleOutMu > ImpVals).astype(np.float64))
+        else:
+            (yRules, dyRules) = (RuleOutMu*ImpVals, RuleOutMu)
+        if self.AggRule=='sum':
+            y = yRules.sum(axis=0)
+        else:
+            y = yRules.max(axis=0)
+            dyRules = dyRules*(np.arange(self.nRules)[:, np.newaxis]==np.argmax(yRules, axis=0))
+        dArea = dx*(dyRules[:, 1:]+dyRules[:, :-1])*.5
+        Area = np.sum(dx*(y[1:]+y[:-1])*.5)
+        dImp = (np.dot(dArea, xMid)-self.FISValue*dArea.sum(axis=1))/Area
+        # Chain rule through rule connectives and mfs
+        AntVals = self._MuVec[RuleIdx]
+        dAnt = np.where(IsAnd[:, np.newaxis], self._ReducerDeriv(self.AndMethod, AntVals), \
+            self._ReducerDeriv(self.OrMethod, AntVals))*dImp[:, np.newaxis]
+        dMu = np.bincount(RuleIdx.ravel(), weights=dAnt.ravel(), minlength=self._MFInp.size)
+        dMu *= EvalMFsDeriv(self._xIn, self._MFInp, self._MFTypes, self._MFParams)
+        dIn = np.bincount(self._MFInp, weights=dMu, minlength=len(self._InputKeys))
+        return dict(zip(self._InputKeys, dIn.tolist()))
     def GetMaxAntecentKey(self):
-        return max(self.InputFuzzyVals.iterkeys(), key=lambda k: self.InputFuzzyVals[k])
+        # Input with the largest membership value of any of its mfs
+        InputFuzzyVals = self.InputFuzzyVals
+        return max(InputFuzzyVals, key=lambda k: max(InputFuzzyVals[k].values()))
     def GetMaxAntecentOfMaxImplicationKey(self):
-        AntecentList = self.InpPerRuleVals[self.GetMaxImplicationKey()]
+        iMax = self.OutImpl.index(max(self.OutImpl))
+        RuleKey = self._RuleKeys[iMax]
+        if (self._InpPerRuleVals is None) and (self._AntVals is not None):
+            # Row of the compiled antecedent values, the dict is not needed
+            AntecentList = self._AntVals[iMax].tolist()
+        else:
+            AntecentList = self.InpPerRuleVals[RuleKey]
         InpMax = AntecentList.index(max(AntecentList))
-        return [self.Rules[self.GetMaxImplicationKey()][InpMax*2+1], self.Rules[self.GetMaxImplicationKey()][InpMax*2+2]]
+        RuleDef = self.Rules[RuleKey]
+        return [RuleDef[InpMax*2+1], RuleDef[InpMax*2+2]]
     def GetMaxImplicationKey(self):
-        return list(self.Rules)[self.OutImpl.index(max(self.OutImpl))]
+        return self._RuleKeys[self.OutImpl.index(max(self.OutImpl))]
     def GetInputVariables(self):
         return self.Input.keys()
     def PlotRules(self, NumSupportPoints=50):
         '''
         Plots all rules of the FIS
         '''
+        Iter = np.linspace(0.,1.,num=NumSupportPoints)
         for iRule in self.Rules.keys():
             RuleDef = self.Rules[iRule]
-            nRules = (len(RuleDef)-4)/2
+            nRules = (len(RuleDef)-4)//2
             MFdict = dict()
             for iInput in range(nRules):
                 iInputKey = RuleDef[1+iInput*2]
                 iMFKey = RuleDef[2+iInput*2]
-                MFdict['In "'+iInputKey+'-'+iMFKey+'"'] = list()
                 iRange = self.Input[iInputKey]['Range']
-                xVals = iRange[0] + (iRange[1]-iRange[0])*np.linspace(0.,1.,num=NumSupportPoints)
-                for iX in xVals:
-                    MFdict['In "'+iInputKey+'-'+iMFKey+'"'].append(self.Input[iInputKey]['MF'][iMFKey](iX))
+                xVals = iRange[0] + (iRange[1]-iRange[0])*Iter
+                MFdict['In "'+iInputKey+'-'+iMFKey+'"'] = self.Input[iInputKey]['MF'][iMFKey].EvalVec(xVals)
             iOutoutKey = RuleDef[-2]
             iMFKey = RuleDef[-1]
-            MFdict['Out "'+iOutoutKey+'-'+iMFKey+'"'] = list()
             iRange = self.Output[iOutoutKey]['Range']
-            xVals = iRange[0] + (iRange[1]-iRange[0])*np.linspace(0.,1.,num=NumSupportPoints)
-            for iX in xVals:
-                MFdict['Out "'+iOutoutKey+'-'+iMFKey+'"'].append(self.Output[iOutoutKey]['MF'][iMFKey](iX))
-            Iter = np.linspace(0.,1.,num=NumSupportPoints)
+            xVals = iRange[0] + (iRange[1]-iRange[0])*Iter
+            MFdict['Out "'+iOutoutKey+'-'+iMFKey+'"'] = self.Output[iOutoutKey]['MF'][iMFKey].EvalVec(xVals)
             self._InputOutputPlot(Iter,MFdict,Label='Rule "'+iRule+'" with "'+RuleDef[0]+'"')
     def PlotInputOutputMFs(self, NumSupportPoints=50):
         '''
@@ -441,18 +1147,14 @@ class FIS(FuzzyTools):
             xVals = iRange[0] + (iRange[1]-iRange[0])*np.linspace(0.,1.,num=NumSupportPoints)
             MFdict = dict()
             for iMF in self.Input[iInput]['MF'].keys():
-                MFdict['MF "'+iMF+'"'] = list()
-                for iX in xVals:
-                    MFdict['MF "'+iMF+'"'].append(self.Input[iInput]['MF'][iMF](iX))
+                MFdict['MF "'+iMF+'"'] = self.Input[iInput]['MF'][iMF].EvalVec(xVals)
             self._InputOutputPlot(xVals,MFdict,Label='Fuzzy input membership functions of '+iInput)
         for iOutput in self.Output.keys():
             iRange = self.Output[iOutput]['Range']
             xVals = iRange[0] + (iRange[1]-iRange[0])*np.linspace(0.,1.,num=NumSupportPoints)
             MFdict = dict()
             for iMF in self.Output[iOutput]['MF'].keys():
-                MFdict['MF "'+iMF+'"'] = list()
-                for iX in xVals:
-                    MFdict['MF "'+iMF+'"'].append(self.Output[iOutput]['MF'][iMF](iX))
+                MFdict['MF "'+iMF+'"'] = self.Output[iOutput]['MF'][iMF].EvalVec(xVals)
             self._InputOutputPlot(xVals,MFdict,Label='Fuzzy output membership functions of '+iOutput)
     def PlotFuzzyInferenceSystem(self, UseTex=False, NumSupportPoints=20, \
             ShowFig=True, FigFile=None, nRulesPerPlot=7.):
@@ -463,8 +1165,9 @@ class FIS(FuzzyTools):
             from mpl_toolkits.mplot3d import Axes3D
             import matplotlib.pyplot as plt
             from matplotlib import cm
-        except:
+        except ImportError:
             logging.error('Matplotlib could not be imported!')
+            raise
         # Initializations
         plt.rc('text', usetex=UseTex)
         Rules = self.Rules.keys()
@@ -508,9 +1211,7 @@ class FIS(FuzzyTools):
                     RuleID*(nInputs+1.)+InputID+1 - (iPlot-2)*nRulesPerPlot*(nInputs+1))
                 X = np.linspace(self.Input[iInput]['Range'][0], \
                     self.Input[iInput]['Range'][1],num=NumSupportPoints)
-                Y = list()
-                for iX in X:
-                    Y.append(self.Input[iInput]['MF'][InputMFID](iX))
+                Y = self.Input[iInput]['MF'][InputMFID].EvalVec(X)
                 if InputID==0:
                     yLabel = 'Rule %i:'%(RuleID)
                 else:
@@ -530,9 +1231,7 @@ class FIS(FuzzyTools):
                 RuleID*(nInputs+1.)+nInputs+1 - (iPlot-2)*nRulesPerPlot*(nInputs+1))
             X = np.linspace(self.Output[Output]['Range'][0], \
                 self.Output[Output]['Range'][1],num=NumSupportPoints)
-            Y = list()
-            for iX in X:
-                Y.append(self.Output[Output]['MF'][OutputMFID](iX))
+            Y = self.Output[Output]['MF'][OutputMFID].EvalVec(X)
             SubTitel = 'Output'
             self._SubPlot(fig, ax, X, Y, Output+': "'+OutputMFID+'"', [], [], ColorCode='r')
             if PlotMEinfo:
@@ -560,7 +1259,7 @@ class FIS(FuzzyTools):
     def _InputOutputPlot(self,xVals,MFdict,Label='Fuzzy variable'):
         try:
             import matplotlib.pyplot as plt
-        except:
+        except ImportError:
             logging.fatal('Could not import matplotlib modules!')
             sys.exit('Failed to import matlotlib package!')
 